@@ -1,108 +1,62 @@
 ﻿import streamlit as st
 import pandas as pd
-from curl_cffi import requests as crequests
-from bs4 import BeautifulSoup
-from deep_translator import GoogleTranslator
-import os
-import re
 import time
-from datetime import datetime
+import os
 import plotly.express as px
 from urllib.parse import quote
-
-# --- [CORE] DATA STORAGE ---
-DATA_FILE = "tcg_master_db.csv"
-HISTORY_FILE = "tcg_price_history.csv"
+from tcg_history import PriceHistory
+from tcg_storage import get_storage
+from tcg_engine import GAMES, WEISS_ORDER, REFRESH_WORKERS, http, images, import_cards, parse_import
+import tcg_refresh
+from tcg_summary import get_summaries, rebuild_summaries, summary_key
+from tcg_metrics import metrics, start_profile, stop_profile
 
 # --- 1. SYSTEM CONFIGURATION ---
-GAMES = ["포켓몬", "원피스", "바이스슈발츠"]
-WEISS_ORDER = ["니케", "벽람항로", "렌탈여친", "데이트 어 라이브", "오버로드", "체리", "블루 아카이브", "최애의 아이", "키", "기타"]
-GAME_URLS = {"포켓몬": "https://yuyu-tei.jp/sell/poc/s/search", "원피스": "https://yuyu-tei.jp/sell/opc/s/search", "바이스슈발츠": "https://yuyu-tei.jp/sell/ws/s/search"}
-translator = GoogleTranslator(source='ja', target='ko')
+GRID_PAGE_SIZE = 36                    # 그리드 한 번에 그리는 카드 수 (6의 배수)
+GRID_PAGE_SIZES = [18, 36, 72, 144]
+PERF_PAGE = bool(os.environ.get("TCG_PERF"))  # 성능 페이지 버튼 표시 (또는 주소에 ?perf=1)
+IMAGE_MODES = {"썸네일 (로컬)": "grid", "모바일 썸네일 (로컬)": "mobile", "원본 (원격)": None}
+storage = st.cache_resource(get_storage)()  # TCG_STORAGE=csv|sqlite (tcg_storage.py 참고)
+rerun = metrics.begin("rerun")              # 이번 rerun 단계별 시간 (성능 페이지, tcg_metrics.py)
+profiler = start_profile() if st.session_state.pop("profile_next", False) else None
 
 # --- 2. DATA ENGINE ---
+# 저장소 버전(파일 mtime / DB 카운터)을 키로 캐시 -> 데이터가 바뀌지 않으면 rerun 시 디스크를 읽지 않음
+@st.cache_data(max_entries=2, show_spinner=False)
+def _cached_master(version):
+    return storage.load_master()
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _cached_history(version):
+    return PriceHistory.from_frame(storage.load_history())
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _cached_summaries(key):
+    # 쓰기 시점에 저장된 요약 표(tcg_summary.py)를 읽기만 함. 키 = 날짜 + 저장소 버전 (전일 대비 값이라 자정에 다시 계산)
+    return get_summaries(storage)
+
+def invalidate_cache():
+    _cached_master.clear(); _cached_history.clear(); _cached_summaries.clear()
+
 def load_data():
-    if not os.path.exists(DATA_FILE):
-        return pd.DataFrame(columns=["card_id", "game", "sub_category", "last_price", "image_url", "stock", "title", "title_ko", "detail_url"])
-    df = pd.read_csv(DATA_FILE).fillna("")
-    if 'last_price' in df.columns:
-        df['last_price'] = pd.to_numeric(df['last_price'], errors='coerce').fillna(0).astype(int)
-    
-    if not df.empty and 'sub_category' in df.columns and 'game' in df.columns:
-        mask = (df['sub_category'] == '일반')
-        df.loc[mask, 'sub_category'] = df.loc[mask, 'game']
-        
-    return df
+    return _cached_master(storage.version())
 
 def load_history():
-    if not os.path.exists(HISTORY_FILE):
-        return pd.DataFrame(columns=["date", "card_id", "price"])
-    return pd.read_csv(HISTORY_FILE)
+    return _cached_history(storage.version())
+
+def load_summaries():
+    return _cached_summaries(summary_key(storage))
 
 def save_data(df):
-    df.to_csv(DATA_FILE, index=False, encoding='utf-8-sig')
+    storage.save_master(df)
+    invalidate_cache()
 
-def get_price_change_info(card_id, current_price):
-    history = load_history()
-    today = datetime.now().strftime("%Y-%m-%d")
-    past = history[(history['card_id'] == card_id) & (history['date'] < today)].sort_values(by="date", ascending=False)
-    
-    if past.empty: return "-", "#94a3b8"
-    last_price = past.iloc[0]['price']
-    diff = current_price - last_price
-    
-    if diff > 0: return f"▲ {diff:,}", "#E11D48"
-    elif diff < 0: return f"▼ {abs(diff):,}", "#2563EB"
-    else: return "-", "#94a3b8"
-
-# --- 3. SCRAPING ENGINE ---
-def get_yuyutei_info(game, card_id):
-    url = GAME_URLS.get(game)
-    if not url: return None
-    try:
-        res = crequests.get(url, params={"search_word": card_id}, impersonate="chrome110", timeout=10)
-        if res.status_code != 200: return None
-        soup = BeautifulSoup(res.content, 'html.parser')
-        
-        candidates = []
-        for b in soup.find_all('div', class_=lambda x: x and 'card-product' in x):
-            if card_id.lower() in b.get_text().lower():
-                p_tag = b.find('strong', class_=lambda x: x and 'text-end' in x)
-                price = 0
-                if p_tag:
-                    price_match = re.search(r'([0-9,]+)', p_tag.get_text())
-                    if price_match:
-                        price = int(price_match.group(1).replace(',', ''))
-                candidates.append({'box': b, 'price': price})
-        
-        if not candidates: return None
-        
-        best_match = sorted(candidates, key=lambda x: x['price'], reverse=True)[0]
-        box = best_match['box']
-        price = best_match['price']
-        
-        s_tag = box.find('label', class_=lambda x: x and 'cart_sell_zaiko' in x)
-        stock = re.search(r'[:：]\s*(\d+)', s_tag.get_text()).group(1) if s_tag and re.search(r'[:：]\s*(\d+)', s_tag.get_text()) else "×"
-        img = box.find('img', class_=lambda x: x and 'img-fluid' in x)
-        img_url = img.get('src') if img else ""
-        t_ja = img.get('alt', card_id) if img else card_id
-        a = box.find('a', href=True)
-        d_url = "https://yuyu-tei.jp" + a['href'] if a and not a['href'].startswith('http') else (a['href'] if a else "")
-        try: t_ko = translator.translate(t_ja)
-        except: t_ko = t_ja
-        
-        history = load_history()
-        today = datetime.now().strftime("%Y-%m-%d")
-        existing = history[(history['date'] == today) & (history['card_id'] == card_id)]
-        if not existing.empty:
-            history.loc[(history['date'] == today) & (history['card_id'] == card_id), 'price'] = price
-        else:
-            new_record = pd.DataFrame([{"date": today, "card_id": card_id, "price": price}])
-            history = pd.concat([history, new_record], ignore_index=True)
-        history.to_csv(HISTORY_FILE, index=False, encoding='utf-8-sig')
-        
-        return {"price": price, "stock": stock, "img": img_url, "t_ja": t_ja, "t_ko": t_ko, "url": d_url}
-    except: return None
+def refresh_summaries():
+    # 삭제 직후 요약 표 다시 계산 (전체 업데이트/등록은 run_refresh, import_cards 안에서 처리)
+    rebuild_summaries(storage)
+    invalidate_cache()
+
+# --- 3. SCRAPING ENGINE -> tcg_engine.py (Streamlit 없이 import 가능, CLI: tcg_refresh.py) ---
 
 # --- 4. COMMERCIAL DESIGN SYSTEM (PC 줄바꿈 방지 적용) ---
 st.set_page_config(page_title="TCG 시세동향 Pro", layout="wide")
@@ -124,6 +78,7 @@ st.markdown("""
             display: -webkit-box; -webkit-line-clamp: 3; -webkit-box-orient: vertical; overflow: hidden; height: 65px;
         }
         .card-id { font-size: 0.75rem; color: #94A3B8; font-weight: 500; margin-bottom: 8px; padding: 0 14px; }
+        div[data-testid="stImage"] img, .card-img-empty { width: 100%; display: block; aspect-ratio: 1/1.4; object-fit: contain; background: #f8f9fa; }
         div[data-testid="stPopover"] button {
             width: calc(100% - 28px); margin-left: 14px; margin-right: 14px;
             font-size: 1.1rem !important; padding: 4px 0px !important; min-height: auto !important;
@@ -224,16 +179,26 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-df = load_data()
+t_load = time.perf_counter()
+with metrics.timer("load_data"): df = load_data()
+with metrics.timer("load_history"): history = load_history()
+with metrics.timer("load_summaries"): summaries = load_summaries()
+changes = summaries['changes']
+load_ms = (time.perf_counter() - t_load) * 1000
 
 # --- 5. SIDEBAR ---
 with st.sidebar:
     st.markdown("<h2 style='color:#B45309; margin-bottom:20px;'>TCG Pro</h2>", unsafe_allow_html=True)
     if 'filter' not in st.session_state: st.session_state.filter = "Dashboard"
     
+    def reset_limits():
+        # 필터/페이지 크기가 바뀌면 '더 보기'로 늘린 목록을 다시 한 페이지로
+        st.session_state.grid_limits = {}
+
     def nav_btn(label):
         if st.button(label, use_container_width=True):
             st.session_state.filter = label.replace("◆ ", "").replace("　 ", "")
+            reset_limits()
             st.rerun()
 
     nav_btn("◆ Dashboard")
@@ -241,45 +206,69 @@ with st.sidebar:
     for g in GAMES: nav_btn(f"◆ {g}")
     st.markdown("<div style='margin:10px 0; border-top:1px solid #E2E8F0;'></div>", unsafe_allow_html=True)
     for title in WEISS_ORDER: nav_btn(f"　 {title}")
+    if PERF_PAGE or st.query_params.get("perf") or st.session_state.filter == "Performance":
+        nav_btn("◆ Performance")
+    st.markdown("<div style='margin:10px 0; border-top:1px solid #E2E8F0;'></div>", unsafe_allow_html=True)
+    st.selectbox("페이지당 카드 수", GRID_PAGE_SIZES, index=GRID_PAGE_SIZES.index(GRID_PAGE_SIZE), key="page_size", on_change=reset_limits)
+    st.selectbox("카드 이미지", list(IMAGE_MODES), key="image_mode")
+    st.caption(f"데이터 로드 {load_ms:.1f} ms")
+    net = http.snapshot()
+    st.caption(f"HTTP 요청 {net['requests']} · 캐시 {net['cache_hits']}/{net['cache_hits'] + net['cache_misses']} · 연결 재사용 {net['reused_connections']}")
+    img = images.snapshot()
+    st.caption(f"이미지 캐시 {img['urls']}장 · {img['files_mb']} MB")
 
 # --- 6. DASHBOARD ---
 st.title(f"{st.session_state.filter}")
 
 if st.session_state.filter == "Dashboard":
-    movers = []
-    if not df.empty:
-        for idx, row in df.iterrows():
-            ch_str, ch_col = get_price_change_info(row['card_id'], row['last_price'])
-            if "▲" in ch_str or "▼" in ch_str:
-                movers.append({"Game": row['game'], "Title": row['title_ko'], "Price": f"{row['last_price']:,}", "Change": ch_str})
+    moved = summaries['movers']
+    movers = pd.DataFrame({
+        "Game": moved['game'], "Title": moved['title_ko'],
+        "Price": moved['last_price'].map("{:,}".format), "Change": moved['ch_str'], "%": moved['pct']
+    })
+    movers_cfg = {"%": st.column_config.NumberColumn("%", format="%.1f%%")}
     
     c_mov, c_up = st.columns([3, 1])
     with c_mov:
         st.markdown('<div class="section-header">⚡ Market Movers (오늘의 변동)</div>', unsafe_allow_html=True)
-        if movers:
-            st.dataframe(pd.DataFrame(movers), use_container_width=True, hide_index=True)
+        if not movers.empty:
+            t_all, t_up, t_down = st.tabs(["전체", "▲ 상승 TOP 10", "▼ 하락 TOP 10"])
+            t_all.dataframe(movers, use_container_width=True, hide_index=True, column_config=movers_cfg)
+            t_up.dataframe(movers[moved['diff'] > 0].head(10), use_container_width=True, hide_index=True, column_config=movers_cfg)
+            t_down.dataframe(movers[moved['diff'] < 0].iloc[::-1].head(10), use_container_width=True, hide_index=True, column_config=movers_cfg)
         else:
             st.info("오늘 변동된 시세 내역이 없습니다.")
     
     with c_up:
         st.markdown('<div class="section-header">Action</div>', unsafe_allow_html=True)
-        if st.button("🔄 시세 전체 업데이트", type="primary", use_container_width=True):
-            if not df.empty:
-                bar = st.progress(0, text="초기화 중..."); log = st.empty()
-                total = len(df)
-                for i, row in df.iterrows():
-                    log.caption(f"[{i+1}/{total}] 업데이트 중: {row['title_ko']}")
-                    bar.progress((i+1)/total, text=f"진행률: {int((i+1)/total*100)}%")
-                    info = get_yuyutei_info(row['game'], row['card_id'])
-                    if info:
-                        df.at[i, 'last_price'] = info['price']
-                        df.at[i, 'stock'] = info['stock']
-                    time.sleep(0.1)
-                save_data(df)
-                log.success("업데이트 완료!")
-                time.sleep(1)
-                st.rerun()
-            else: st.warning("카드가 없습니다.")
+        workers = st.number_input("동시 요청 수", min_value=1, max_value=32, value=REFRESH_WORKERS)
+        # 스크래핑은 앱 밖(tcg_refresh.py, 분리된 프로세스)에서 실행 -> 탭을 닫거나 rerun 돼도 계속 진행, 체크포인트로 이어서 실행
+        # 여기서는 상태 파일/체크포인트만 읽음. 새 시세는 저장소 버전이 바뀌면서 자동으로 다시 읽힘
+        running = tcg_refresh.is_running()
+        if st.button("🔄 시세 전체 업데이트", type="primary", use_container_width=True, disabled=running):
+            if df.empty: st.warning("카드가 없습니다.")
+            elif tcg_refresh.launch(["--workers", str(workers)]) is None: st.warning("이미 업데이트가 실행 중입니다.")
+            else: st.rerun()
+
+        def refresh_status():
+            status, running = tcg_refresh.read_status(), tcg_refresh.is_running()
+            if running:
+                done, total = status.get('done') or 0, status.get('total') or 0
+                st.progress(min(done / total, 1.0) if total else 0.0, text=f"⏳ 업데이트 중 {done}/{total}")
+                st.caption(f"시작 {status.get('started', '-')} · pid {status.get('pid', '-')}")
+            elif st.session_state.pop("refresh_running", False):
+                st.rerun()      # 방금 끝남 -> 전체 화면을 새 데이터로 다시 그림
+            elif status.get('state') == "done":
+                st.caption(f"✅ 마지막 업데이트 {status['finished']} · {status['updated']}개 갱신 · {status['failed']}개 실패 · {status['seconds']}초")
+            elif status:
+                # 실행 중 표시인데 잠금이 없으면 프로세스가 비정상 종료된 것
+                state = {"error": "오류", "interrupted": "중단됨"}.get(status.get('state'), "비정상 종료")
+                resume = tcg_refresh.checkpoint_done()
+                st.warning(f"마지막 업데이트 {state} ({status.get('finished') or status.get('started', '-')})"
+                           + (f" · 체크포인트 {resume}/{status.get('total', '?')} 완료, 다시 실행하면 이어서 진행" if resume else ""))
+            if running: st.session_state.refresh_running = True
+        st.fragment(refresh_status, run_every=3 if running else None)()
+        st.caption(f"터미널/예약 실행: `python tcg_refresh.py --workers {workers}`")
 
     st.markdown("---")
 
@@ -288,12 +277,13 @@ if st.session_state.filter == "Dashboard":
         c1, c2 = st.columns([1, 2.5])
         with c1:
             st.caption("카테고리별 요약")
-            st.dataframe(df.groupby(['game', 'sub_category']).size().reset_index(name='Count'), use_container_width=True, hide_index=True)
+            st.dataframe(summaries['categories'], use_container_width=True, hide_index=True,
+                         column_config={"Value": st.column_config.NumberColumn("Value", format="%d 円"), "OutOfStock": "품절"})
         with c2:
             c_head, c_btn = st.columns([4, 1])
             c_head.caption("전체 리스트 (체크 후 삭제)")
             
-            edit_df = df[['sub_category', 'card_id', 'title_ko', 'last_price']].sort_values(by="last_price", ascending=False).copy()
+            edit_df = summaries['price_list'].copy()
             edit_df.insert(0, "Sel", False)
             
             edited = st.data_editor(
@@ -308,6 +298,7 @@ if st.session_state.filter == "Dashboard":
                 if len(del_ids) > 0:
                     df = df[~df['card_id'].isin(del_ids)]
                     save_data(df)
+                    refresh_summaries()
                     st.rerun()
 
     with st.expander("➕ 새 카드 등록하기 (진행 상황 표시)", expanded=True):
@@ -320,51 +311,64 @@ if st.session_state.filter == "Dashboard":
         else:
             s_in = g_in 
             c3.text_input("타이틀 (자동)", value=s_in, disabled=True)
+        csv_in = st.file_uploader("또는 CSV 업로드 (card_id, game, sub_category 열 또는 머리글 없이 이 순서 / 빈 값은 위 선택값)", type="csv")
 
         if st.button("등록 시작"):
-            ids = [x.strip() for x in ids_in.split('\n') if x.strip()][:20]
-            if not ids:
+            items = parse_import(ids_in, csv_in, g_in, s_in)
+            if items.empty:
                 st.warning("카드 ID를 입력해주세요.")
             else:
                 progress_bar = st.progress(0, text="준비 중...")
                 status_box = st.empty()
-                added_count = 0
-                for idx, cid in enumerate(ids):
-                    status_box.markdown(f"🔍 **분석 중...** (`{cid}`)")
-                    progress_bar.progress((idx + 1) / len(ids))
-                    info = get_yuyutei_info(g_in, cid)
-                    if info and cid not in df['card_id'].values:
-                        new_row = {
-                            "card_id": cid, "game": g_in, "sub_category": s_in, "last_price": info['price'],
-                            "image_url": info['img'], "stock": info['stock'], "title": info['t_ja'],
-                            "title_ko": info['t_ko'], "detail_url": info['url']
-                        }
-                        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                        added_count += 1
-                save_data(df)
-                status_box.success(f"✅ 작업 완료! {added_count}개의 카드가 추가되었습니다.")
+                def on_progress(n, total, row, info):
+                    status_box.markdown(f"🔍 **분석 중...** (`{row['card_id']}`) {'' if info else '— 찾지 못함'}")
+                    progress_bar.progress(n / total, text=f"{n}/{total}")
+                # IMPORT_BATCH 개마다 번역 + 저장되므로 중간에 멈춰도 저장된 카드는 남음
+                report = import_cards(storage, items, workers, on_progress=on_progress)
+                invalidate_cache()
+                st.session_state.import_report = report
+                status_box.success(f"✅ 작업 완료! {len(report['added'])}개 추가, {len(report['skipped'])}개 건너뜀(이미 등록/중복), {len(report['not_found'])}개 찾지 못함")
                 time.sleep(1.5); st.rerun()
 
+        report = st.session_state.get("import_report")
+        if report:
+            st.caption(f"최근 등록: 추가 {len(report['added'])} · 건너뜀 {len(report['skipped'])} · 찾지 못함 {len(report['not_found'])}")
+            if report['not_found']: st.text_area("찾지 못한 카드", "\n".join(report['not_found']), disabled=True)
+            if report['skipped']: st.text_area("건너뛴 카드 (이미 등록/중복)", "\n".join(report['skipped']), disabled=True)
+
 # --- 7. GRID RENDERER ---
-def render_grid(target_df):
-    target_df = target_df.sort_values(by="last_price", ascending=False)
-    hist_db = load_history()
+@metrics.timed("images.thumb")
+def image_src(url, kind):
+    # 로컬 캐시 썸네일 bytes (st.image -> 미디어 URL, 브라우저 캐시 가능). 캐시에 없으면 원격 URL, 다음 업데이트 때 캐시됨
+    if not isinstance(url, str) or not url: return None
+    if not kind: return url
+    return images.thumb_bytes(url, kind) or url
+
+@metrics.timed("render_grid")
+def render_grid(target_df, hist_db, changes, key="grid"):
+    # 페이지 단위로만 그림 -> 카드 수가 늘어도 렌더링 비용 일정, '더 보기'로 추가 로드
+    page_size = st.session_state.get("page_size", GRID_PAGE_SIZE)
+    img_kind = IMAGE_MODES.get(st.session_state.get("image_mode"), "grid")
+    limits = st.session_state.setdefault("grid_limits", {})
+    limit_key = (st.session_state.filter, key)     # 같은 카테고리라도 화면(필터)마다 따로
+    limit = limits.get(limit_key, page_size)
+    total = len(target_df)
+    target_df = target_df.sort_values(by="last_price", ascending=False).head(limit)
     
     for i in range(0, len(target_df), 6):
         batch = target_df.iloc[i:i+6]
         cols = st.columns(6)
         for j, (idx, row) in enumerate(batch.iterrows()):
             with cols[j]:
+                t_card = time.perf_counter()
                 with st.container(border=True):
-                    ch_str, ch_col = get_price_change_info(row['card_id'], row['last_price'])
+                    ch_str, ch_col = changes.at[row['card_id'], 'ch_str'], changes.at[row['card_id'], 'ch_col']
                     ebay_u = f"https://www.ebay.com/sch/i.html?_nkw={quote(row['card_id'] + ' PSA10')}"
                     merc_u = f"https://jp.mercari.com/search?keyword={quote(row['card_id'] + ' PSA10')}"
                     
-                    st.markdown(f"""
-                        <div style="margin: -15px -15px 12px -15px;">
-                            <img src="{row['image_url']}" style="width:100%; display:block; aspect-ratio:1/1.4; object-fit:contain; background:#f8f9fa;">
-                        </div>
-                    """, unsafe_allow_html=True)
+                    src = image_src(row['image_url'], img_kind)
+                    if src is not None: st.image(src, use_container_width=True)
+                    else: st.markdown('<div class="card-img-empty"></div>', unsafe_allow_html=True)
                     
                     st.markdown(f"""
                         <div class="card-title" title="{row['title_ko']}">{row['title_ko']}</div>
@@ -373,13 +377,17 @@ def render_grid(target_df):
 
                     with st.popover(f"{row['last_price']:,} 円", use_container_width=True):
                         st.caption(f"📈 Trend: {row['title_ko']}")
-                        c_hist = hist_db[hist_db['card_id'] == row['card_id']].sort_values(by="date")
-                        if len(c_hist) > 1:
-                            fig = px.line(c_hist, x="date", y="price", markers=True)
-                            fig.update_layout(height=200, margin=dict(l=10, r=10, t=10, b=10), showlegend=False)
-                            # [FIX] Add unique key to avoid duplicate ID error
-                            st.plotly_chart(fig, use_container_width=True, key=f"chart_{row['card_id']}")
-                        else: st.info("데이터 수집 중입니다.")
+                        # 차트는 토글을 켠 카드만 생성 (팝오버를 열지 않은 카드는 차트 JSON 전송 없음)
+                        if st.toggle("추이 보기", key=f"trend_{key}_{row['card_id']}"):
+                            # 기간에 따라 일/주/월 단위로 요약된 시계열 (점 개수 제한)
+                            with metrics.timer("history.resample"): c_hist = hist_db.resample(row['card_id'])
+                            if len(c_hist) > 1:
+                                with metrics.timer("plotly"):
+                                    fig = px.line(c_hist, x="date", y="last", markers=True, line_shape="hv", hover_data=["min", "max"], labels={"last": "price"})
+                                    fig.update_layout(height=200, margin=dict(l=10, r=10, t=10, b=10), showlegend=False)
+                                    # [FIX] Add unique key to avoid duplicate ID error
+                                    st.plotly_chart(fig, use_container_width=True, key=f"chart_{key}_{row['card_id']}")
+                            else: st.info("데이터 수집 중입니다.")
 
                     st.markdown(f"""
                         <div class="compact-info-row">
@@ -397,6 +405,12 @@ def render_grid(target_df):
                             </div>
                         </div>
                     """, unsafe_allow_html=True)
+                metrics.card(row['card_id'], time.perf_counter() - t_card)  # 성능 페이지의 느린 카드 목록
+
+    if limit < total:
+        if st.button(f"더 보기 ({limit}/{total})", key=f"more_{key}", use_container_width=True):
+            limits[limit_key] = limit + page_size
+            st.rerun()
 
 f = st.session_state.filter
 disp = df.copy()
@@ -404,22 +418,61 @@ if f in GAMES: disp = disp[disp['game'] == f]
 elif f in WEISS_ORDER: disp = disp[disp['sub_category'] == f]
 
 st.divider()
-if not disp.empty:
+if f == "Performance":
+    st.caption("마지막 업데이트/등록과 마지막 화면 갱신(rerun)의 단계별 시간")
+elif not disp.empty:
     if f == "Dashboard":
         all_categories = ["포켓몬", "원피스"] + WEISS_ORDER
         for sub in all_categories:
             s_df = disp[disp['sub_category'] == sub]
             if not s_df.empty:
                 st.markdown(f'<div class="section-header">{sub}</div>', unsafe_allow_html=True)
-                render_grid(s_df)
+                render_grid(s_df, history, changes, key=sub)
                 
     elif f == "바이스슈발츠":
         for sub in WEISS_ORDER:
             s_df = disp[disp['sub_category'] == sub]
             if not s_df.empty:
                 st.markdown(f'<div class="section-header">{sub}</div>', unsafe_allow_html=True)
-                render_grid(s_df)
+                render_grid(s_df, history, changes, key=sub)
     else:
-        render_grid(disp)
+        render_grid(disp, history, changes, key=f)
 else:
-    st.info("데이터가 없습니다. 대시보드에서 카드를 등록해주세요.")
\ No newline at end of file
+    st.info("데이터가 없습니다. 대시보드에서 카드를 등록해주세요.")
+
+# --- 8. PERFORMANCE ---
+# 이번 rerun 측정을 끝낸 뒤에 그림 (성능 페이지 자체는 rerun 시간에 포함되지 않음)
+st.session_state.last_rerun = metrics.end(rerun)   # 세션별 (다른 세션의 rerun 과 섞이지 않음)
+if profiler: st.session_state.profile_report = stop_profile(profiler)
+
+def render_metrics(summary, title):
+    st.markdown(f'<div class="section-header">{title}</div>', unsafe_allow_html=True)
+    if not summary:
+        st.info("아직 측정된 기록이 없습니다.")
+        return
+    st.caption(f"{summary['ts']} · 전체 {summary['seconds'] * 1000:,.1f} ms")
+    c1, c2 = st.columns([2, 1])
+    c1.dataframe(pd.DataFrame(summary['stages']), use_container_width=True, hide_index=True)
+    if summary['slowest']: c2.dataframe(pd.DataFrame(summary['slowest']), use_container_width=True, hide_index=True)
+
+def latest_run(label):
+    # 이 프로세스의 기록과 TCG_METRICS_FILE 에 저장된 기록(tcg_refresh.py CLI 실행 포함) 중 최근 것
+    runs = [s for s in (metrics.last.get(label), metrics.load_last(label)) if s]
+    return max(runs, key=lambda s: s['ts']) if runs else None
+
+if f == "Performance":
+    render_metrics(latest_run("refresh"), "🔄 마지막 시세 업데이트")
+    render_metrics(latest_run("import"), "➕ 마지막 카드 등록")
+    render_metrics(st.session_state.get("last_rerun"), "🖥️ 마지막 화면 갱신 (rerun)")
+
+    c1, c2 = st.columns(2)
+    if c1.button("🧪 다음 rerun 프로파일 (cProfile)", use_container_width=True):
+        st.session_state.profile_next = True
+        st.rerun()
+    c2.download_button("📥 기록 내보내기 (JSON lines)", metrics.to_jsonl(), file_name="tcg_metrics.jsonl",
+                       mime="application/x-ndjson", use_container_width=True)
+    if metrics.export_path: st.caption(f"실행마다 {metrics.export_path} 에 추가 저장 중 (TCG_METRICS_FILE)")
+    else: st.caption("TCG_METRICS_FILE 을 지정하면 CLI(tcg_refresh.py) 업데이트 기록도 여기에 표시됩니다")
+    if st.session_state.get("profile_report"):
+        with st.expander("cProfile 결과 (누적 시간 상위 30)", expanded=True):
+            st.code(st.session_state.profile_report)
\ No newline at end of file
@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tcg_extract import available_backends, extract_page
+
+# HTML 추출 백엔드 마이크로 벤치마크 (저장된 fixtures 사용, 네트워크 없음)
+#   python bench/bench_extract.py [--rounds 20] [--backend lxml bs4]
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIELDS = ["price", "stock", "img", "title", "url"]
+
+def load_pages():
+    pages = {}
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), "rb") as f: pages[name] = f.read()
+    return pages
+
+def summary(result):
+    return [tuple(c[f] for f in FIELDS) for c in result["cards"]], result["next"]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--backend", nargs="*", default=None)
+    args = ap.parse_args(argv)
+
+    pages = load_pages()
+    backends = args.backend or available_backends()
+    print(f"fixtures: {len(pages)} pages, {sum(map(len, pages.values())) / 1024:.0f} KB / backends: {', '.join(backends)}")
+
+    # 모든 백엔드가 같은 결과를 내는지 먼저 확인
+    baseline = {name: summary(extract_page(html, backends[0])) for name, html in pages.items()}
+    for b in backends[1:]:
+        for name, html in pages.items():
+            if summary(extract_page(html, b)) != baseline[name]:
+                print(f"  !! {b} 결과가 {backends[0]} 와 다름: {name}")
+
+    print(f"{'backend':<12}{'pages/s':>10}{'cards/s':>12}{'ms/page':>10}")
+    for b in backends:
+        n_cards = 0
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for html in pages.values():
+                n_cards += len(extract_page(html, b)["cards"])
+        elapsed = time.perf_counter() - start
+        n_pages = args.rounds * len(pages)
+        print(f"{b:<12}{n_pages / elapsed:>10.1f}{n_cards / elapsed:>12.0f}{elapsed / n_pages * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from datetime import datetime
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+import tcg_engine
+from standin_server import synthetic_ids
+from tcg_http import HttpClient
+from tcg_storage import CsvStorage, SqliteStorage
+from tcg_translate import TranslationCache
+
+# 오프라인 스크래핑 벤치마크: 로컬 대역 서버(standin_server.py)를 띄우고
+# 등록 경로(import_cards: 동시 조회 + 배치 번역/저장)와 전체 업데이트 경로(run_refresh)를 합성 인벤토리로 측정
+#   python bench/bench_scrape.py --sizes 100 1000 10000 --latency 20 --error-rate 0.01
+# 지표: cards/s, p50/p95 카드당 지연(ms), 서버 요청 수, 재시도, 최대 메모리(tracemalloc)
+#   p50/p95: 시작부터 각 카드 결과가 나올 때까지의 시간
+# 번역은 원문을 그대로 돌려주는 로컬 스텁 (캐시/배치 경로는 그대로, 외부 API 호출 없음)
+# 결과는 bench/results.jsonl 에 한 줄씩 추가 (실행 간 비교용, git 에서 제외됨)
+
+GAME = "바이스슈발츠"
+RESULTS_FILE = os.path.join(BENCH_DIR, "results.jsonl")
+
+def start_server(args):
+    cmd = [sys.executable, os.path.join(BENCH_DIR, "standin_server.py"), "--port", "0", "--cards", str(max(args.sizes)),
+           "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    url = proc.stdout.readline().strip().split(": ", 1)[1]
+    return proc, url
+
+def server_stats(url):
+    base = url.split("/sell/")[0]
+    with urllib.request.urlopen(base + "/__stats") as res: return json.load(res)
+
+def percentile(values, q):
+    if not values: return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+def git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError: return ""
+
+class EchoTranslator:
+    def translate(self, text): return text
+
+def make_storage(storage_kind, tmp, name):
+    if storage_kind == "sqlite": return SqliteStorage(os.path.join(tmp, f"{name}.db"))
+    return CsvStorage(os.path.join(tmp, f"{name}_master.csv"), os.path.join(tmp, f"{name}_history.csv"))
+
+def bench_register(ids, workers, storage_kind, tmp):
+    # 등록 경로: 앱의 대량 등록과 같은 import_cards (빈 저장소에 전부 새 카드로 등록)
+    storage = make_storage(storage_kind, tmp, f"register_{len(ids)}")
+    items = pd.DataFrame({"card_id": ids, "game": GAME, "sub_category": "기타"})
+    latencies = []
+    start = time.perf_counter()
+    def on_progress(n, total, row, info):
+        latencies.append((time.perf_counter() - start) * 1000)
+    report = tcg_engine.import_cards(storage, items, workers, on_progress=on_progress, prefetch_images=False)
+    return latencies, len(report["added"])
+
+def bench_refresh(ids, workers, storage_kind, tmp):
+    # 전체 업데이트 경로: 세트 단위 조회 + 중간 저장까지 포함
+    storage = make_storage(storage_kind, tmp, f"refresh_{len(ids)}")
+    master = pd.DataFrame({"card_id": ids, "game": GAME, "sub_category": "기타", "last_price": 0, "image_url": "",
+                           "stock": "", "title": ids, "title_ko": ids, "detail_url": ""})
+    storage.save_master(master)
+    latencies, found = [], 0
+    start = time.perf_counter()
+    def on_progress(n, total, row, info):
+        nonlocal found
+        latencies.append((time.perf_counter() - start) * 1000)
+        found += bool(info)
+    tcg_engine.run_refresh(storage, storage.load_master(), workers, on_progress=on_progress, prefetch_images=False)
+    return latencies, found
+
+def run_case(path, ids, args, url, tmp):
+    before_srv, before_cli = server_stats(url), tcg_engine.http.snapshot()
+    if args.memory: tracemalloc.start()
+    start = time.perf_counter()
+    if path == "register": latencies, found = bench_register(ids, args.workers, args.storage, tmp)
+    else: latencies, found = bench_refresh(ids, args.workers, args.storage, tmp)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if args.memory else None
+    if args.memory: tracemalloc.stop()
+    srv, cli = server_stats(url), tcg_engine.http.snapshot()
+    return {
+        "ts": datetime.now().isoformat(timespec="seconds"), "commit": git_commit(), "path": path, "size": len(ids),
+        "workers": args.workers, "latency_ms": args.latency, "error_rate": args.error_rate, "storage": args.storage,
+        "rate_limit": args.rate, "seconds": round(elapsed, 3), "cards_per_s": round(len(ids) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1), "p95_ms": round(percentile(latencies, 95), 1),
+        "found": found, "requests": srv["requests"] - before_srv["requests"],
+        "server_errors": srv["errors"] - before_srv["errors"], "retries": cli["retries"] - before_cli["retries"],
+        "peak_mem_mb": round(peak, 1) if peak is not None else None,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--paths", nargs="+", choices=["register", "refresh"], default=["register", "refresh"])
+    ap.add_argument("--workers", type=int, default=tcg_engine.REFRESH_WORKERS)
+    ap.add_argument("--latency", type=float, default=20, help="서버 응답 지연 ms")
+    ap.add_argument("--jitter", type=float, default=5)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--rate", type=float, default=0, help="초당 요청 제한 (0: 제한 없음)")
+    ap.add_argument("--storage", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--no-memory", dest="memory", action="store_false", help="tracemalloc 끄기 (오버헤드 제거)")
+    ap.add_argument("--out", default=RESULTS_FILE)
+    args = ap.parse_args(argv)
+
+    proc, url = start_server(args)
+    tcg_engine.GAME_URLS[GAME] = url
+    throttle = None
+    if args.rate > 0:
+        bucket = tcg_engine.TokenBucket(args.rate, max(1, int(args.rate)))
+        throttle = lambda u: bucket.acquire()
+    # 응답 캐시 끄고, 재시도 백오프는 짧게 (서버 오류는 Retry-After: 0)
+    tcg_engine.http = HttpClient(cache_ttl=0, backoff=0.05, throttle=throttle)
+
+    print(f"{'path':<10}{'size':>7}{'cards/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'requests':>10}{'retries':>9}{'found':>8}{'mem MB':>8}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tcg_engine.translator = TranslationCache(EchoTranslator(), path=os.path.join(tmp, "translate_cache.json"))
+            for size in args.sizes:
+                ids = synthetic_ids(size)
+                for path in args.paths:
+                    r = run_case(path, ids, args, url, tmp)
+                    print(f"{path:<10}{size:>7}{r['cards_per_s']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}"
+                          f"{r['requests']:>10}{r['retries']:>9}{r['found']:>8}{r['peak_mem_mb'] or '-':>8}")
+                    with open(args.out, "a", encoding="utf-8") as f: f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    finally:
+        proc.terminate()
+    print(f"결과 저장: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import lxml.html
+from lxml import etree
+
+# 로컬 yuyu-tei 대역 서버 (벤치마크용, 네트워크 없음)
+# 저장된 검색 페이지(fixtures)의 레이아웃과 card-product 박스를 그대로 틀로 써서
+# 합성 인벤토리(X000-000SP ...)에 대한 검색 결과를 돌려줌
+#   search_word=X001-005SP -> 해당 카드 1장 / search_word=X001 -> 세트 전체 (PAGE_SIZE 단위 페이지)
+#   GET /__stats -> {"requests": n, "errors": n}
+#   python bench/standin_server.py --cards 10000 --latency 20 --error-rate 0.01
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ws_search_S117_p1.html")
+SET_SIZE = 40
+PAGE_SIZE = 60
+MARKER = "<!--CARDS-->"
+
+def synthetic_ids(n, set_size=SET_SIZE):
+    return [f"X{i // set_size:03d}-{i % set_size:03d}SP" for i in range(n)]
+
+def _num(card_id, lo, hi):
+    return lo + int(hashlib.md5(card_id.encode()).hexdigest()[:8], 16) % (hi - lo)
+
+def load_template(path=FIXTURE):
+    # 녹화 페이지 -> (박스 틀, 페이지 앞부분, 페이지 뒷부분)
+    with open(path, "rb") as f: doc = lxml.html.fromstring(f.read().decode("utf-8"))
+    boxes = doc.xpath('//div[contains(@class, "card-product")]')
+    box = boxes[0]
+    for el in box.xpath('.//a[@href]'): el.set("href", "{href}")
+    for el in box.xpath('.//img[contains(@class, "img-fluid")]'): el.set("src", "{img}"); el.set("alt", "{title}")
+    for el in box.xpath('.//span'): el.text = "{card_id}"
+    for el in box.xpath('.//h4'): el.text = "{name}"
+    for el in box.xpath('.//strong[contains(@class, "text-end")]'): el.text = "{price:,} 円"
+    for el in box.xpath('.//label[contains(@class, "cart_sell_zaiko")]'): el.text = "在庫 : {stock} 点"
+    template = lxml.html.tostring(box, encoding="unicode")
+
+    parent = box.getparent()
+    for b in boxes: b.getparent().remove(b)
+    for nav in doc.xpath('//ul[contains(@class, "pagination")]'): nav.getparent().remove(nav)
+    parent.append(etree.Comment("CARDS"))
+    prefix, suffix = lxml.html.tostring(doc, encoding="unicode").split(MARKER)
+    return template, "<!DOCTYPE html>\n" + prefix, suffix
+
+class Inventory:
+    def __init__(self, n_cards, set_size=SET_SIZE):
+        self.ids = synthetic_ids(n_cards, set_size)
+        self.sets = {}
+        for cid in self.ids: self.sets.setdefault(cid.split("-")[0], []).append(cid)
+        self.template, self.prefix, self.suffix = load_template()
+
+    def render_box(self, cid):
+        n = _num(cid, 1, 99999)
+        return self.template.format(
+            href=f"/sell/ws/card/xx/{n}", img=f"https://card.yuyu-tei.jp/ws/100_140/xx/{n}.jpg",
+            title=html.escape(f"XX/{cid} SP ベンチマーク{n}"), card_id=cid, name=f"ベンチマーク{n}",
+            price=_num(cid, 1, 900) * 100, stock=_num(cid, 0, 6),
+        )
+
+    def render(self, word, page=1):
+        word = (word or "").strip().upper()
+        if word in self.sets:
+            cards = self.sets[word]
+        else:
+            cards = [cid for cid in self.sets.get(word.split("-")[0], []) if word and word in cid]
+        chunk = cards[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+        nav = ""
+        if page * PAGE_SIZE < len(cards):
+            nav = f'<ul class="pagination"><li><a rel="next" href="?search_word={word}&amp;page={page + 1}">次へ</a></li></ul>'
+        return (self.prefix + "".join(self.render_box(c) for c in chunk) + nav + self.suffix).encode("utf-8")
+
+def make_server(port, inventory, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=0):
+    stats = {"requests": 0, "errors": 0}
+    lock, rng = threading.Lock(), random.Random(seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def _send(self, code, body=b"", headers=()):
+            self.send_response(code)
+            for k, v in headers: self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/__stats":
+                with lock: body = json.dumps(stats).encode()
+                return self._send(200, body, [("Content-Type", "application/json")])
+            with lock:
+                stats["requests"] += 1
+                fail = rng.random() < error_rate
+                delay = (latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+                if fail: stats["errors"] += 1
+            if delay > 0: time.sleep(delay)
+            if fail:
+                return self._send(429 if rng.random() < 0.5 else 503, headers=[("Retry-After", "0")])
+            q = parse_qs(url.query)
+            body = inventory.render(q.get("search_word", [""])[0], int(q.get("page", ["1"])[0]))
+            self._send(200, body, [("Content-Type", "text/html; charset=UTF-8")])
+
+        def log_message(self, *args): pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--cards", type=int, default=10000)
+    ap.add_argument("--set-size", type=int, default=SET_SIZE)
+    ap.add_argument("--latency", type=float, default=20, help="응답 지연 ms")
+    ap.add_argument("--jitter", type=float, default=5, help="지연 편차 ms")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="429/503 응답 비율")
+    args = ap.parse_args(argv)
+    server = make_server(args.port, Inventory(args.cards, args.set_size), args.latency, args.jitter, args.error_rate)
+    print(f"stand-in server: http://127.0.0.1:{server.server_address[1]}/sell/ws/s/search", flush=True)
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse
+
+import pandas as pd
+from deep_translator import GoogleTranslator
+
+from tcg_extract import extract_page
+from tcg_http import HttpClient
+from tcg_images import ImageCache
+from tcg_metrics import metrics
+from tcg_storage import today_str
+from tcg_summary import rebuild_summaries
+from tcg_translate import TranslationCache
+
+# Streamlit 없이 import 가능한 데이터/스크래핑 엔진 (UI: TCG Price.py, CLI: tcg_refresh.py)
+
+# --- 1. SYSTEM CONFIGURATION ---
+GAMES = ["포켓몬", "원피스", "바이스슈발츠"]
+WEISS_ORDER = ["니케", "벽람항로", "렌탈여친", "데이트 어 라이브", "오버로드", "체리", "블루 아카이브", "최애의 아이", "키", "기타"]
+GAME_URLS = {"포켓몬": "https://yuyu-tei.jp/sell/poc/s/search", "원피스": "https://yuyu-tei.jp/sell/opc/s/search", "바이스슈발츠": "https://yuyu-tei.jp/sell/ws/s/search"}
+translator = TranslationCache(GoogleTranslator(source='ja', target='ko'))  # 디스크 캐시 (tcg_translate.py)
+REFRESH_WORKERS = 8                    # 전체 업데이트 동시 요청 수 (기본값)
+RATE_LIMITS = {"yuyu-tei.jp": (4.0, 8)}  # host: (초당 요청 수, 버스트)
+COMMIT_EVERY = 50                      # 업데이트 중 이 개수마다 중간 저장
+IMPORT_BATCH = 100                     # 대량 등록 시 이 개수마다 번역 + 저장
+
+# --- 2. SCRAPING ENGINE ---
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate, self.capacity = rate, capacity
+        self.tokens, self.stamp = capacity, time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_buckets = {host: TokenBucket(rate, burst) for host, (rate, burst) in RATE_LIMITS.items()}
+
+def throttle(url):
+    host = urlparse(url).hostname or ""
+    for h, bucket in _buckets.items():
+        if host == h or host.endswith("." + h):
+            bucket.acquire()
+
+http = HttpClient(throttle=throttle)   # keep-alive 세션 + 재시도 + 응답 캐시 (tcg_http.py)
+images = ImageCache(http)              # 카드 이미지 로컬 캐시 + 썸네일 (tcg_images.py)
+
+def fetch_page(url, params=None):
+    # 응답 HTML을 tcg_extract 로 한 번에 파싱 -> {"cards": [...], "next": href}
+    with metrics.timer("http"): res = http.get(url, params)
+    if res.status_code != 200: return None
+    with metrics.timer("parse"): return extract_page(res.content)
+
+@metrics.timed("lookup.card")
+def get_yuyutei_info(game, card_id, translate=True):
+    # translate=False: 제목 번역 생략 (t_ko=None, 이미 title_ko가 있는 카드 갱신용)
+    url = GAME_URLS.get(game)
+    if not url: return None
+    try:
+        page = fetch_page(url, {"search_word": card_id})
+        if page is None: return None
+        
+        key = card_id.lower()
+        candidates = [c for c in page['cards'] if key in c['text'].lower()]
+        if not candidates: return None
+        
+        best_match = max(candidates, key=lambda x: x['price'])
+        price = best_match['price']
+        t_ja = best_match['title'] if best_match['title'] is not None else card_id
+        t_ko = None
+        if translate:
+            with metrics.timer("translate"): t_ko = translator.translate(t_ja)
+        
+        return {"price": price, "stock": best_match['stock'], "img": best_match['img'], "t_ja": t_ja, "t_ko": t_ko, "url": best_match['url']}
+    except: return None
+
+# --- 2-1. SET BATCH SCRAPING ---
+SET_BATCH_MIN = 3       # 같은 세트 카드가 이 개수 이상이면 세트 단위로 한 번에 조회
+SET_MAX_PAGES = 20
+SET_CODE_RE = re.compile(r'^([A-Za-z0-9]+)-[A-Za-z0-9]+$')
+CARD_ID_RE = re.compile(r'[A-Za-z0-9]+-[A-Za-z0-9]+')
+
+def set_code(card_id):
+    # "S117-010SP" -> "S117", 포켓몬처럼 형식이 다른 번호는 None
+    m = SET_CODE_RE.match(str(card_id).strip())
+    return m.group(1).upper() if m else None
+
+@metrics.timed("lookup.set")
+def get_set_index(game, code):
+    # 세트 검색 결과(페이지 포함)를 한 번만 받아 card_id -> {price, stock, img, title, url} 인덱스로 만듦
+    url = GAME_URLS.get(game)
+    index = {}
+    if not url: return index
+    params, seen = {"search_word": code}, set()
+    try:
+        while url and url not in seen and len(seen) < SET_MAX_PAGES:
+            seen.add(url)
+            page = fetch_page(url, params)
+            if page is None: break
+            for info in page['cards']:
+                text = info['text'] + " " + (info['title'] or "")
+                for cid in set(CARD_ID_RE.findall(text.upper())):
+                    if cid not in index or info['price'] > index[cid]['price']:
+                        index[cid] = info
+            url, params = (urljoin(url, page['next']), None) if page['next'] else (None, None)
+    except: pass
+    return index
+
+def _lookup_card(game, card_id):
+    # 카드별 소요 시간 기록 (성능 페이지의 느린 카드 목록)
+    t = time.perf_counter()
+    info = get_yuyutei_info(game, card_id, False)
+    metrics.card(card_id, time.perf_counter() - t)
+    return info
+
+def _lookup_set(game, code):
+    t = time.perf_counter()
+    index = get_set_index(game, code)
+    metrics.card(f"{code} (세트)", time.perf_counter() - t)
+    return index
+
+def refresh_prices(target_df, workers=REFRESH_WORKERS):
+    # 완료 순서대로 (index, info) 를 돌려줌. 기록은 호출하는 쪽에서 한 번에 처리
+    groups, singles = {}, []
+    for i, row in target_df.iterrows():
+        code = set_code(row['card_id'])
+        if code: groups.setdefault((row['game'], code), []).append(i)
+        else: singles.append(i)
+
+    # with 블록 대신 직접 종료: 중간에 멈추면(Ctrl-C, Streamlit 중단/rerun, 제너레이터 close) 대기 중인 조회는 취소하고
+    # 이미 보낸 요청만 끝나게 둠 -> 남은 카드를 계속 받느라 멈추지 않는 문제 방지
+    pool = ThreadPoolExecutor(max_workers=max(1, int(workers)))
+    def submit_single(i):
+        return pool.submit(metrics.bind(_lookup_card), target_df.at[i, 'game'], target_df.at[i, 'card_id'])
+
+    try:
+        futures = {}
+        for (game, code), idxs in groups.items():
+            if len(idxs) >= SET_BATCH_MIN: futures[pool.submit(metrics.bind(_lookup_set), game, code)] = idxs
+            else: singles += idxs
+        for i in singles: futures[submit_single(i)] = i
+
+        while futures:
+            for fut in as_completed(list(futures)):
+                key = futures.pop(fut)
+                if isinstance(key, list):
+                    index = fut.result()
+                    for i in key:
+                        entry = index.get(str(target_df.at[i, 'card_id']).upper())
+                        # 세트 목록에서 못 찾은 카드는 개별 검색으로 재시도
+                        if entry: yield i, entry
+                        else: futures[submit_single(i)] = i
+                else:
+                    yield key, fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+# --- 3. REFRESH RUNNER ---
+@metrics.timed("storage.write")
+def apply_results(storage, target_df, results):
+    # results: {index: info} -> 가격/재고 반영 + 오늘 시세 기록 (변경된 행만 upsert)
+    if not results: return target_df.iloc[0:0]
+    idx = list(results)
+    rows = target_df.loc[idx].copy()
+    rows['last_price'] = [int(results[i]['price']) for i in idx]
+    rows['stock'] = [str(results[i]['stock']) for i in idx]
+    storage.record_prices(list(zip(rows['card_id'], rows['last_price'], rows['stock'])))
+    storage.upsert_cards(rows)
+    return rows
+
+class Checkpoint:
+    # 끝난 card_id 목록을 파일에 남겨 중단된 업데이트를 이어서 실행
+    def __init__(self, path, card_ids):
+        self.path = path
+        digest = hashlib.sha1("\n".join(sorted(map(str, card_ids))).encode('utf-8')).hexdigest()[:12]
+        self.key = f"{today_str()}:{digest}"  # 같은 날, 같은 대상일 때만 이어서 실행
+        self.done = set()
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f: data = json.load(f)
+                if data.get('key') == self.key: self.done = set(data.get('done', []))
+            except (OSError, ValueError): pass
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump({"key": self.key, "done": sorted(self.done)}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path): os.remove(self.path)
+
+@metrics.traced("refresh")
+def run_refresh(storage, target_df, workers=REFRESH_WORKERS, commit_every=COMMIT_EVERY, checkpoint=None, on_progress=None,
+                prefetch_images=True):
+    # COMMIT_EVERY 개마다 저장 -> 중간에 끊겨도 그때까지의 결과는 남음
+    # on_progress(n, total, row, info) 는 결과가 나올 때마다 호출
+    # 마지막 단계: 캐시에 없는 카드 이미지 다운로드 + 썸네일 생성 (prefetch_images=False 로 생략)
+    if checkpoint: target_df = target_df[~target_df['card_id'].astype(str).isin(checkpoint.done)]
+    total, updated = len(target_df), 0
+    pending, batch_ids = {}, []
+
+    def commit():
+        nonlocal pending, batch_ids, updated
+        updated += len(apply_results(storage, target_df, pending))
+        if checkpoint:
+            checkpoint.done.update(batch_ids)
+            with metrics.timer("checkpoint"): checkpoint.save()
+        pending, batch_ids = {}, []
+
+    results = refresh_prices(target_df, workers)
+    try:
+        for n, (i, info) in enumerate(results, 1):
+            batch_ids.append(str(target_df.at[i, 'card_id']))
+            if info: pending[i] = info
+            if on_progress: on_progress(n, total, target_df.loc[i], info)
+            if len(batch_ids) >= commit_every: commit()
+    finally:
+        # 중단돼도 남은 조회는 취소하고, 받은 결과와 체크포인트는 저장 (다음 실행에서 이어서 진행)
+        results.close()
+        commit()
+    if checkpoint: checkpoint.clear()
+    if prefetch_images:
+        with metrics.timer("images.prefetch"): images.prefetch(target_df['image_url'], workers)
+    with metrics.timer("summaries"): rebuild_summaries(storage)
+    return updated
+
+# --- 4. BULK IMPORT ---
+IMPORT_COLUMNS = ["card_id", "game", "sub_category"]
+ID_SPLIT_RE = re.compile(r'[\r\n\t,;]+')
+
+def parse_import(text="", csv_file=None, game=None, sub_category=None):
+    # 붙여넣은 ID 목록(줄바꿈/쉼표 구분) + CSV(card_id[, game, sub_category]) -> card_id, game, sub_category 프레임
+    # CSV에 game 이 없거나 비어 있으면 기본값(game) 사용
+    parts = [pd.DataFrame({"card_id": [x.strip() for x in ID_SPLIT_RE.split(text or "") if x.strip()]})]
+    if csv_file is not None:
+        up = pd.read_csv(csv_file, dtype=str, encoding='utf-8-sig')
+        up.columns = [str(c).strip().lower() for c in up.columns]
+        if not set(IMPORT_COLUMNS) & set(up.columns):
+            # 머리글 없는 파일(ID 목록 등): 첫 줄도 데이터 -> 다시 읽고 열 순서대로 card_id, game, sub_category
+            if hasattr(csv_file, "seek"): csv_file.seek(0)
+            up = pd.read_csv(csv_file, dtype=str, encoding='utf-8-sig', header=None)
+            up = up.iloc[:, :len(IMPORT_COLUMNS)]
+            up.columns = IMPORT_COLUMNS[:len(up.columns)]
+        elif 'card_id' not in up.columns: up = up.rename(columns={up.columns[0]: 'card_id'})
+        parts.append(up[[c for c in IMPORT_COLUMNS if c in up.columns]])
+    items = pd.concat(parts, ignore_index=True).reindex(columns=IMPORT_COLUMNS)
+    items['card_id'] = items['card_id'].fillna("").astype(str).str.strip()
+    g = items['game'].fillna("").astype(str).str.strip()
+    items['game'] = g.mask(g == "", game or "")
+    # 서브 카테고리 기본값: 바이스슈발츠는 선택한 타이틀(없으면 기타), 나머지 게임은 게임 이름
+    weiss_sub = sub_category if sub_category in WEISS_ORDER else "기타"
+    sub = items['sub_category'].fillna("").astype(str).str.strip()
+    items['sub_category'] = sub.mask(sub == "", items['game'].where(items['game'] != "바이스슈발츠", weiss_sub))
+    return items[items['card_id'] != ""].reset_index(drop=True)
+
+@metrics.traced("import")
+def import_cards(storage, items, workers=REFRESH_WORKERS, batch_size=IMPORT_BATCH, on_progress=None, prefetch_images=True):
+    # 이미 있는 card_id / 입력 중복은 조회 전에 제외 (set), 나머지는 refresh_prices 로 동시 조회
+    # batch_size 개마다 제목 번역 + 시세 기록 + 카드 추가 -> 중간에 끊겨도 저장된 카드는 남음
+    # on_progress(n, total, row, info), 반환: {"added": [...], "skipped": [...], "not_found": [...]}
+    existing = set(storage.load_master()['card_id'].astype(str))
+    report = {"added": [], "skipped": [], "not_found": []}
+    targets, seen = [], set()
+    for row in items.itertuples(index=False):
+        if row.card_id in existing or row.card_id in seen: report["skipped"].append(row.card_id)
+        else:
+            seen.add(row.card_id)
+            targets.append(row)
+    targets = pd.DataFrame(targets, columns=IMPORT_COLUMNS)
+    total, pending, new_images = len(targets), [], []
+
+    def commit():
+        nonlocal pending
+        if not pending: return
+        with metrics.timer("translate"): titles_ko = translator.translate_many([r['title'] for r in pending])
+        for r, t_ko in zip(pending, titles_ko): r['title_ko'] = t_ko
+        with metrics.timer("storage.write"):
+            storage.record_prices([(r['card_id'], r['last_price'], r['stock']) for r in pending])
+            storage.upsert_cards(pd.DataFrame(pending))
+        report["added"] += [r['card_id'] for r in pending]
+        new_images.extend(r['image_url'] for r in pending)
+        pending = []
+
+    results = refresh_prices(targets, workers)
+    try:
+        for n, (i, info) in enumerate(results, 1):
+            row = targets.loc[i]
+            if info:
+                # 개별 검색(get_yuyutei_info)은 t_ja, 세트 목록(get_set_index)은 title
+                title = info.get('t_ja') or info.get('title') or row['card_id']
+                pending.append({
+                    "card_id": row['card_id'], "game": row['game'], "sub_category": row['sub_category'],
+                    "last_price": int(info['price']), "image_url": info['img'], "stock": str(info['stock']),
+                    "title": title, "title_ko": "", "detail_url": info['url']
+                })
+            else: report["not_found"].append(row['card_id'])
+            if on_progress: on_progress(n, total, row, info)
+            if len(pending) >= batch_size: commit()
+    finally:
+        results.close()
+        commit()
+    if prefetch_images:
+        with metrics.timer("images.prefetch"): images.prefetch(new_images, workers)
+    with metrics.timer("summaries"): rebuild_summaries(storage)
+    return report
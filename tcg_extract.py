@@ -0,0 +1,94 @@
+import os
+import re
+
+# yuyu-tei 검색 결과 페이지 -> card-product 박스별 필드 추출 (한 번의 순회로 처리)
+# 백엔드: selectolax > lxml > BeautifulSoup 순으로 설치된 것 사용, TCG_HTML_BACKEND 로 지정 가능
+# 반환: {"cards": [{price, stock, img, title, url, text}, ...], "next": 다음 페이지 href 또는 None}
+
+PRICE_RE = re.compile(r'([0-9,]+)')
+STOCK_RE = re.compile(r'[:：]\s*(\d+)')
+
+def _card(price_text, stock_text, img_url, title, href, text):
+    m = PRICE_RE.search(price_text or "")
+    price = int(m.group(1).replace(',', '')) if m else 0
+    m = STOCK_RE.search(stock_text or "")
+    stock = m.group(1) if m else "×"
+    d_url = ("https://yuyu-tei.jp" + href if not href.startswith('http') else href) if href else ""
+    return {"price": price, "stock": stock, "img": img_url or "", "title": title, "url": d_url, "text": " ".join(text.split())}
+
+# --- selectolax ---
+def _extract_selectolax(html):
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html)
+    cards = []
+    for box in tree.css('div[class*="card-product"]'):
+        p = box.css_first('strong[class*="text-end"]')
+        s = box.css_first('label[class*="cart_sell_zaiko"]')
+        img = box.css_first('img[class*="img-fluid"]')
+        a = box.css_first('a[href]')
+        cards.append(_card(
+            p.text() if p else None, s.text() if s else None,
+            img.attributes.get('src') if img else "", img.attributes.get('alt') if img else None,
+            a.attributes.get('href') if a else None, box.text(separator=" "),
+        ))
+    nxt = tree.css_first('a[rel="next"][href]')
+    return {"cards": cards, "next": nxt.attributes.get('href') if nxt else None}
+
+# --- lxml ---
+def _extract_lxml(html):
+    import lxml.html
+    doc = lxml.html.fromstring(html)
+    cards = []
+    for box in doc.xpath('//div[contains(@class, "card-product")]'):
+        p = box.xpath('.//strong[contains(@class, "text-end")]')
+        s = box.xpath('.//label[contains(@class, "cart_sell_zaiko")]')
+        img = box.xpath('.//img[contains(@class, "img-fluid")]')
+        a = box.xpath('.//a[@href]')
+        cards.append(_card(
+            p[0].text_content() if p else None, s[0].text_content() if s else None,
+            img[0].get('src') if img else "", img[0].get('alt') if img else None,
+            a[0].get('href') if a else None, " ".join(box.itertext()),
+        ))
+    nxt = doc.xpath('//a[@rel="next"][@href]')
+    return {"cards": cards, "next": nxt[0].get('href') if nxt else None}
+
+# --- BeautifulSoup (fallback) ---
+def _extract_bs4(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = []
+    for box in soup.find_all('div', class_=lambda x: x and 'card-product' in x):
+        p = box.find('strong', class_=lambda x: x and 'text-end' in x)
+        s = box.find('label', class_=lambda x: x and 'cart_sell_zaiko' in x)
+        img = box.find('img', class_=lambda x: x and 'img-fluid' in x)
+        a = box.find('a', href=True)
+        cards.append(_card(
+            p.get_text() if p else None, s.get_text() if s else None,
+            img.get('src') if img else "", img.get('alt') if img else None,
+            a['href'] if a else None, box.get_text(" "),
+        ))
+    nxt = soup.find('a', rel='next', href=True)
+    return {"cards": cards, "next": nxt['href'] if nxt else None}
+
+BACKENDS = {"selectolax": _extract_selectolax, "lxml": _extract_lxml, "bs4": _extract_bs4}
+_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml.html", "bs4": "bs4"}
+
+def available_backends():
+    out = []
+    for name, mod in _MODULES.items():
+        try: __import__(mod)
+        except ImportError: continue
+        out.append(name)
+    return out
+
+def default_backend():
+    name = os.environ.get("TCG_HTML_BACKEND")
+    available = available_backends()
+    if name in available: return name
+    return available[0] if available else "bs4"
+
+BACKEND = default_backend()
+
+def extract_page(html, backend=None):
+    if isinstance(html, bytes): html = html.decode('utf-8', errors='replace')  # yuyu-tei는 UTF-8
+    return BACKENDS[backend or BACKEND](html)
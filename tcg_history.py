@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# --- PRICE HISTORY (변경분만 저장) ---
+# 카드별로 가격/재고가 바뀐 날만 한 행 (run-length). 메모리에서는 card_id=category, day=int32(1970-01-01 기준 일수)
+# "특정 날짜 기준 가격"은 그 날짜 이전 마지막 변경값, 차트용 시계열은 일/주/월 단위 min-max-last 로 요약
+
+FREQS = {"W": "W-SUN", "M": "MS"}
+AUTO_DAILY_DAYS = 120       # 이 기간 이하: 일 단위
+AUTO_WEEKLY_DAYS = 730      # 이 기간 이하: 주 단위, 초과: 월 단위
+
+def today_str():
+    return datetime.now().strftime("%Y-%m-%d")
+
+def to_day(date):
+    return int(np.datetime64(str(date)[:10], 'D').astype(np.int64))
+
+def from_day(day):
+    return str(np.datetime64(int(day), 'D'))
+
+def compact_rows(history):
+    # 같은 카드에서 직전 행과 가격/재고가 같은 행 제거 (date 문자열 프레임 그대로 처리)
+    if history.empty: return history
+    history = history.sort_values(['card_id', 'date'], kind='stable')
+    stock = history['stock'].fillna("").astype(str) if 'stock' in history.columns else pd.Series("", index=history.index)
+    same_card = history['card_id'].eq(history['card_id'].shift())
+    same_value = history['price'].eq(history['price'].shift()) & stock.eq(stock.shift())
+    return history[~(same_card & same_value)]
+
+class PriceHistory:
+    def __init__(self, frame):
+        # frame: card_id(category), day(int32), price(int32), stock(category) / (card_id, day) 정렬, 변경분만
+        self.frame = frame.reset_index(drop=True)
+        self._rows = self.frame.groupby('card_id', observed=True).indices
+
+    @classmethod
+    def from_frame(cls, history):
+        # 저장소 형식(date 문자열, card_id, price[, stock]) -> 압축된 PriceHistory
+        history = history.copy()
+        if 'stock' not in history.columns: history['stock'] = ""
+        history = history.dropna(subset=['date', 'card_id'])
+        history['price'] = pd.to_numeric(history['price'], errors='coerce').fillna(0)
+        history = compact_rows(history)
+        frame = pd.DataFrame({
+            "card_id": history['card_id'].astype(str).astype('category'),
+            "day": pd.to_datetime(history['date'].astype(str).str[:10]).values.astype('datetime64[D]').astype(np.int32),
+            "price": history['price'].astype(np.int32),
+            "stock": history['stock'].fillna("").astype(str).astype('category'),
+        })
+        return cls(frame)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def to_frame(self):
+        out = self.frame.copy()
+        out.insert(0, 'date', out.pop('day').map(from_day))
+        out['card_id'] = out['card_id'].astype(str)
+        return out
+
+    def price_as_of(self, date):
+        # date 당일까지의 마지막 가격 (card_id 인덱스 Series)
+        sub = self.frame[self.frame['day'] <= to_day(date)]
+        last = sub.drop_duplicates(subset='card_id', keep='last')
+        return pd.Series(last['price'].values, index=last['card_id'].astype(str).values, name='price')
+
+    def series(self, card_id, start=None, end=None):
+        # 기간 안의 변경 행 + 시작일 직전 값(시작 시점 가격)
+        rows = self._rows.get(card_id)
+        if rows is None: return self.frame.iloc[0:0]
+        card = self.frame.iloc[rows]
+        if start is not None:
+            d = to_day(start)
+            before = card[card['day'] < d].tail(1).assign(day=d)
+            card = pd.concat([before, card[card['day'] >= d]])
+        if end is not None:
+            card = card[card['day'] <= to_day(end)]
+        return card
+
+    def resample(self, card_id, freq="auto", start=None, end=None):
+        # 일(D)/주(W)/월(M) 단위 min-max-last. freq="auto" 는 기간 길이로 선택 -> 차트 점 개수 제한
+        card = self.series(card_id, start, end)
+        if card.empty: return pd.DataFrame(columns=["date", "min", "max", "last"])
+        first = int(card['day'].iloc[0])
+        last_day = to_day(end) if end is not None else max(int(card['day'].iloc[-1]), to_day(today_str()))
+        span = last_day - first
+        if freq == "auto":
+            freq = "D" if span <= AUTO_DAILY_DAYS else ("W" if span <= AUTO_WEEKLY_DAYS else "M")
+        idx = pd.to_datetime(card['day'].values.astype('datetime64[D]'))
+        daily = pd.Series(card['price'].values, index=idx)
+        daily = daily[~daily.index.duplicated(keep='last')]
+        daily = daily.reindex(pd.date_range(idx[0], from_day(last_day), freq='D')).ffill()
+        if freq == "D":
+            out = pd.DataFrame({"min": daily, "max": daily, "last": daily})
+        else:
+            g = daily.resample(FREQS[freq])
+            out = pd.DataFrame({"min": g.min(), "max": g.max(), "last": g.last()})
+        out = out.dropna().astype(int)
+        out.index.name = "date"
+        return out.reset_index()
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlencode
+
+from curl_cffi import CurlInfo
+from curl_cffi import requests as crequests
+
+# --- HTTP CLIENT ---
+# 스레드별 keep-alive 세션 재사용 + 429/5xx 재시도(백오프) + 짧은 TTL 디스크 응답 캐시
+# TTL 이 지난 캐시는 ETag/Last-Modified 가 있으면 조건부 요청(If-None-Match/If-Modified-Since) -> 304 면 본문 재사용
+CACHE_DIR = ".http_cache"
+CACHE_TTL = 600                         # 초. 등록 직후 업데이트 등 같은 페이지 재요청을 디스크에서 처리
+CACHE_KEEP = 86400                      # 초. 조건부 요청용으로 보관하는 기간 (지나면 prune 에서 삭제)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 60                    # 초. 서버가 보낸 Retry-After 상한 (작업 스레드가 오래 멈추지 않게)
+
+Response = namedtuple("Response", ["status_code", "content", "from_cache"])
+
+class HttpClient:
+    def __init__(self, impersonate="chrome110", timeout=10, retries=3, backoff=1.0,
+                 cache_dir=CACHE_DIR, cache_ttl=CACHE_TTL, throttle=None):
+        self.impersonate, self.timeout = impersonate, timeout
+        self.retries, self.backoff = retries, backoff
+        self.cache_dir, self.cache_ttl = cache_dir, cache_ttl
+        self.throttle = throttle            # 실제 요청 직전에 호출 (호스트별 속도 제한)
+        self._local = threading.local()
+        self.lock = threading.Lock()
+        self.stats = dict.fromkeys(["requests", "cache_hits", "cache_misses", "not_modified", "retries", "errors",
+                                    "sessions", "new_connections", "reused_connections"], 0)
+        self._pruned = 0.0
+        self.prune()
+
+    def _count(self, key, n=1):
+        with self.lock: self.stats[key] += n
+
+    def snapshot(self):
+        with self.lock: return dict(self.stats)
+
+    def _session(self):
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = crequests.Session(impersonate=self.impersonate, curl_infos=[CurlInfo.NUM_CONNECTS])
+            self._local.session = s
+            self._count("sessions")
+        return s
+
+    # --- disk cache ---
+    def _cache_path(self, url, params):
+        key = url + ("?" + urlencode(sorted(params.items())) if params else "")
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".html")
+
+    def _cache_get(self, path):
+        # -> (본문, 신선 여부). TTL 이 지났어도 검증 헤더가 있으면 조건부 요청용으로 본문을 돌려줌
+        try:
+            fresh = time.time() - os.path.getmtime(path) < self.cache_ttl
+            with open(path, "rb") as f: return f.read(), fresh
+        except OSError: return None, False
+
+    def _validators(self, path):
+        try:
+            with open(path + ".meta", encoding='utf-8') as f: meta = json.load(f)
+        except (OSError, ValueError): return {}
+        headers = {}
+        if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _write_file(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f: f.write(data)
+        os.replace(tmp, path)
+
+    def _cache_put(self, path, content, headers):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._write_file(path, content)
+        meta = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        if any(meta.values()): self._write_file(path + ".meta", json.dumps(meta).encode('utf-8'))
+        elif os.path.exists(path + ".meta"): os.remove(path + ".meta")
+
+    def prune(self):
+        # 보관 기간이 지난 캐시 파일 정리. get() 에서도 TTL 마다 한 번씩 호출 (--every 반복 실행에서 무한히 쌓이지 않게)
+        self._pruned = time.time()
+        if not os.path.isdir(self.cache_dir): return
+        keep = max(self.cache_ttl, CACHE_KEEP)
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if self._pruned - os.path.getmtime(path) >= keep: os.remove(path)
+            except OSError: pass
+
+    # --- request ---
+    def get(self, url, params=None, use_cache=True):
+        use_cache = use_cache and self.cache_ttl > 0
+        path = self._cache_path(url, params) if use_cache else None
+        cached, headers = None, {}
+        if path:
+            if time.time() - self._pruned >= self.cache_ttl: self.prune()
+            cached, fresh = self._cache_get(path)
+            if fresh:
+                self._count("cache_hits")
+                return Response(200, cached, True)
+            self._count("cache_misses")
+            if cached is not None: headers = self._validators(path)
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+            if self.throttle: self.throttle(url)
+            try:
+                res = self._session().get(url, params=params, headers=headers or None, timeout=self.timeout)
+            except Exception:
+                self._count("errors")
+                if attempt == self.retries: raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            self._count("requests")
+            self._count("new_connections" if res.infos.get(CurlInfo.NUM_CONNECTS) else "reused_connections")
+            if res.status_code == 304 and headers:
+                # 바뀌지 않음 -> 캐시 본문 재사용, mtime 갱신으로 다시 TTL 동안 신선
+                self._count("not_modified")
+                for p in (path, path + ".meta"):
+                    if os.path.exists(p): os.utime(p)
+                return Response(200, cached, True)
+            if res.status_code in RETRY_STATUS and attempt < self.retries:
+                retry_after = res.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+                time.sleep(min(delay, MAX_RETRY_AFTER))
+                continue
+            if res.status_code == 200 and path: self._cache_put(path, res.content, res.headers)
+            return Response(res.status_code, res.content, False)
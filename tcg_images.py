@@ -0,0 +1,224 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from PIL import Image
+except ImportError:         # Pillow 없으면 썸네일 대신 원본을 그대로 사용
+    Image = None
+
+# --- IMAGE CACHE (카드 이미지 로컬 캐시 + 썸네일) ---
+# 원본은 내용 해시(sha1) 이름으로 한 번만 저장, url -> 해시 인덱스(index.json)
+# 썸네일은 원본 크기 기준으로 줄인 JPEG (원본보다 작아지지 않으면 만들지 않고 원본 사용)
+# 파일 mtime 을 마지막 사용 시각으로 보고 용량 초과 시 오래된 것부터 삭제(LRU).
+# 화면 렌더링 중에는 디스크에 쓰지 않음: 읽은 bytes 는 메모리에 보관, 사용 시각은 모아 두었다가 save/evict 때 반영
+# 앱은 bytes 를 st.image 로 넘김 -> Streamlit 미디어 URL(내용 해시)로 제공되어 브라우저가 캐시함
+IMAGE_DIR = ".image_cache"
+IMAGE_MAX_MB = 200
+THUMB_SIZES = {"grid": (240, 336), "mobile": (120, 168)}   # 상한 (px)
+THUMB_SCALE = {"grid": 1.0, "mobile": 0.6}                 # 원본 크기 대비 비율
+THUMB_QUALITY = 80
+INDEX_FILE = "index.json"
+MEMO_ITEMS = 1000       # 메모리에 두는 썸네일 수
+SYNC_INTERVAL = 5       # 초. 다른 프로세스가 바꾼 인덱스를 확인하는 간격
+
+def thumbnail_size(source, kind):
+    # 원본 (w, h) -> 썸네일 (w, h). 원본보다 작아지지 않으면 None (원본 그대로 사용)
+    w, h = source
+    bw, bh = THUMB_SIZES[kind]
+    scale = min(THUMB_SCALE[kind], bw / w, bh / h)
+    return (max(1, int(w * scale)), max(1, int(h * scale))) if scale < 1 else None
+
+def make_thumbnail(data, kind):
+    # 비율 유지 축소 -> JPEG bytes (줄일 필요 없거나, Pillow 없거나, 디코딩 실패 시 None)
+    if Image is None: return None
+    try:
+        with Image.open(io.BytesIO(data)) as im:
+            size = thumbnail_size(im.size, kind)
+            if size is None: return None
+            im = im.convert("RGB")
+            im.thumbnail(size, Image.LANCZOS)
+            out = io.BytesIO()
+            im.save(out, "JPEG", quality=THUMB_QUALITY, optimize=True)
+            return out.getvalue()
+    except Exception: return None
+
+class ImageCache:
+    # http: tcg_http.HttpClient (keep-alive 세션 + 속도 제한 공유)
+    def __init__(self, http, path=IMAGE_DIR, max_mb=IMAGE_MAX_MB):
+        self.http, self.path = http, path
+        self.max_bytes = int(max_mb * 2 ** 20)
+        self.lock = threading.Lock()
+        self.stats = dict.fromkeys(["hits", "misses", "downloads", "errors", "thumbnails", "evicted"], 0)
+        self.index, self._index_mtime, self._synced = {}, None, 0.0
+        self._memo, self._used = OrderedDict(), {}    # (digest, kind) -> bytes / digest -> 마지막 사용 시각
+        self._sync(force=True)
+        self.total = self._scan_size()
+
+    def _count(self, key, n=1):
+        with self.lock: self.stats[key] += n
+
+    def snapshot(self):
+        with self.lock: return dict(self.stats, files_mb=round(self.total / 2 ** 20, 1), urls=len(self.index))
+
+    # --- index (url -> content digest) ---
+    def _index_path(self):
+        return os.path.join(self.path, INDEX_FILE)
+
+    def _sync(self, force=False):
+        # 다른 프로세스(tcg_refresh.py)가 인덱스를 갱신했으면 다시 읽음 (SYNC_INTERVAL 마다 한 번만 확인)
+        now = time.time()
+        if not force and now - self._synced < SYNC_INTERVAL: return
+        self._synced = now
+        try: mtime = os.path.getmtime(self._index_path())
+        except OSError: return
+        if mtime == self._index_mtime: return
+        try:
+            with open(self._index_path(), encoding='utf-8') as f: index = json.load(f)
+        except (OSError, ValueError): return
+        with self.lock: self.index, self._index_mtime = index, mtime
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._flush_used()
+        with self.lock: data = json.dumps(self.index)
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f: f.write(data)
+        os.replace(tmp, self._index_path())
+        self._index_mtime = os.path.getmtime(self._index_path())
+
+    # --- files ---
+    def _file(self, digest, kind="orig"):
+        return os.path.join(self.path, digest[:2], f"{digest}.{kind}")
+
+    def _scan_size(self):
+        total = 0
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                if name == INDEX_FILE: continue
+                try: total += os.path.getsize(os.path.join(root, name))
+                except OSError: pass
+        return total
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f: return f.read()
+        except OSError: return None
+
+    def _flush_used(self):
+        # 렌더링 중 모아 둔 사용 시각을 파일 mtime 에 반영 (LRU 순서)
+        with self.lock: used, self._used = self._used, {}
+        for digest, ts in used.items():
+            for kind in ["orig"] + [k + ".jpg" for k in THUMB_SIZES]:
+                try: os.utime(self._file(digest, kind), (ts, ts))
+                except OSError: pass
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existed = os.path.exists(path)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f: f.write(data)
+        os.replace(tmp, path)
+        if not existed:
+            with self.lock: self.total += len(data)
+
+    def evict(self):
+        # 용량 초과분을 마지막 사용 시각이 오래된 파일부터 삭제 (90% 까지)
+        if self.total <= self.max_bytes: return 0
+        self._flush_used()
+        files = []
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                if name == INDEX_FILE or name.endswith(".tmp"): continue
+                p = os.path.join(root, name)
+                try: st = os.stat(p)
+                except OSError: continue
+                files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total, target, removed = sum(f[1] for f in files), int(self.max_bytes * 0.9), 0
+        for _, size, p in files:
+            if total <= target: break
+            try: os.remove(p)
+            except OSError: continue
+            total -= size
+            removed += 1
+        with self.lock: self.total = total
+        self._count("evicted", removed)
+        return removed
+
+    # --- fetch / thumbnails ---
+    def cached(self, url):
+        digest = self.index.get(url)
+        return bool(digest) and (os.path.exists(self._file(digest, "grid.jpg")) or os.path.exists(self._file(digest)))
+
+    def fetch(self, url):
+        # 원본 다운로드(이미 캐시에 있으면 생략) + 썸네일 생성 -> digest 또는 None
+        if not url: return None
+        if self.cached(url):
+            digest = self.index[url]
+            self._count("hits")
+            return digest
+        self._count("misses")
+        try: res = self.http.get(url, use_cache=False)
+        except Exception: res = None
+        if res is None or res.status_code != 200 or not res.content:
+            self._count("errors")
+            return None
+        self._count("downloads")
+        digest = hashlib.sha1(res.content).hexdigest()
+        if not os.path.exists(self._file(digest)): self._write(self._file(digest), res.content)
+        for kind in THUMB_SIZES: self._thumb(digest, kind, res.content)
+        with self.lock: self.index[url] = digest
+        return digest
+
+    def _thumb(self, digest, kind, data=None):
+        path = self._file(digest, kind + ".jpg")
+        if os.path.exists(path): return path
+        if data is None: data = self._read(self._file(digest))
+        thumb = make_thumbnail(data, kind) if data else None
+        if thumb is None: return None
+        self._write(path, thumb)
+        self._count("thumbnails")
+        return path
+
+    def thumb_bytes(self, url, kind="grid"):
+        # 캐시에 있는 썸네일(줄일 필요 없으면 원본) bytes, 캐시에 없으면 None (여기서는 다운로드하지 않음)
+        # 한 번 읽은 bytes 는 메모리에 보관 (내용 해시 기준이라 파일이 지워져도 그대로 유효)
+        self._sync()
+        digest = self.index.get(url)
+        if not digest: return None
+        key = (digest, kind)
+        with self.lock:
+            self._used[digest] = time.time()
+            data = self._memo.get(key)
+            if data is not None:
+                self._memo.move_to_end(key)
+                return data
+        path = self._thumb(digest, kind)
+        data = self._read(path if path else self._file(digest))
+        if data is None: return None
+        with self.lock:
+            self._memo[key] = data
+            while len(self._memo) > MEMO_ITEMS: self._memo.popitem(last=False)
+        return data
+
+    def prefetch(self, urls, workers=8, on_progress=None):
+        # 캐시에 없는 이미지만 동시에 받아 썸네일까지 생성. on_progress(n, total, url, ok)
+        self._sync(force=True)
+        urls = [u for u in dict.fromkeys(urls) if isinstance(u, str) and u and not self.cached(u)]
+        ok = 0
+        if urls:
+            with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+                futures = {pool.submit(self.fetch, u): u for u in urls}
+                for n, fut in enumerate(as_completed(futures), 1):
+                    got = fut.result() is not None
+                    ok += got
+                    if on_progress: on_progress(n, len(urls), futures[fut], got)
+            self.save()
+        self.evict()
+        return ok, len(urls)
@@ -0,0 +1,164 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# --- METRICS (단계별 시간/호출 수) ---
+# 실행 단위(run: refresh / import / rerun)를 열어 두면 그 동안의 timer 기록이 모임. 열린 run 이 없으면 기록하지 않음
+# run 은 연 스레드에만 속함 (Streamlit 세션별 스크립트 스레드가 서로 섞이지 않음). 작업 스레드로는 bind() 로 넘김
+#   with metrics.run("refresh"): ... / @metrics.traced("refresh")  (엔진/CLI)
+#   r = metrics.begin("rerun") ... metrics.end(r) (Streamlit 스크립트: st.rerun() 으로 끊긴 run 은 다음 begin 에서 버림)
+#   with metrics.timer("http"): ...  /  @metrics.timed("parse")  /  pool.submit(metrics.bind(func), ...)
+# 끝난 run 요약은 metrics.last[label] / metrics.history, TCG_METRICS_FILE 이 있으면 JSON lines 로 추가 저장
+# 다른 프로세스(CLI)의 run 은 metrics.load_last(label) 로 그 파일에서 읽음
+METRICS_FILE = os.environ.get("TCG_METRICS_FILE", "")
+HISTORY_RUNS = 50
+SLOWEST_CARDS = 10
+
+class Run:
+    def __init__(self, label):
+        self.label, self.started = label, time.perf_counter()
+        self.ts = datetime.now().isoformat(timespec="seconds")
+        self.stages, self.cards = {}, {}     # stage: [calls, total, max] / card: seconds
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds, n=1):
+        with self.lock:
+            s = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            s[0] += n; s[1] += seconds; s[2] = max(s[2], seconds)
+
+    def add_card(self, card_id, seconds):
+        with self.lock: self.cards[card_id] = self.cards.get(card_id, 0.0) + seconds
+
+    def summary(self, top=SLOWEST_CARDS):
+        with self.lock:
+            stages = [{"stage": k, "calls": c, "total_ms": round(t * 1000, 1), "avg_ms": round(t / c * 1000, 2) if c else 0.0,
+                       "max_ms": round(m * 1000, 1)} for k, (c, t, m) in self.stages.items()]
+            slowest = sorted(self.cards.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        return {"ts": self.ts, "label": self.label, "seconds": round(time.perf_counter() - self.started, 3),
+                "stages": sorted(stages, key=lambda s: s["total_ms"], reverse=True),
+                "slowest": [{"card_id": k, "ms": round(v * 1000, 1)} for k, v in slowest]}
+
+class Metrics:
+    def __init__(self, export_path=METRICS_FILE):
+        self.export_path = export_path
+        self.last = {}
+        self.history = deque(maxlen=HISTORY_RUNS)
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def _runs(self):
+        # 현재 스레드에 열린 run 들
+        return getattr(self._local, "runs", ())
+
+    def begin(self, label):
+        r = Run(label)
+        self._local.runs = tuple(a for a in self._runs() if a.label != label) + (r,)
+        return r
+
+    def end(self, r):
+        runs = self._runs()
+        if r not in runs: return None
+        self._local.runs = tuple(a for a in runs if a is not r)
+        summary = r.summary()
+        with self.lock:
+            self.last[r.label] = summary
+            self.history.append(summary)
+        if self.export_path: self.export([summary], self.export_path)
+        return summary
+
+    @contextmanager
+    def run(self, label):
+        r = self.begin(label)
+        try: yield r
+        finally: self.end(r)
+
+    def traced(self, label):
+        # 함수 호출 전체를 하나의 run 으로 (run_refresh, import_cards)
+        def wrap(func):
+            @wraps(func)
+            def inner(*args, **kwargs):
+                with self.run(label): return func(*args, **kwargs)
+            return inner
+        return wrap
+
+    def bind(self, func):
+        # 현재 스레드의 run 을 작업 스레드에서도 쓰도록 감쌈 (ThreadPoolExecutor.submit 용)
+        runs = self._runs()
+        if not runs: return func
+        @wraps(func)
+        def inner(*args, **kwargs):
+            prev, self._local.runs = self._runs(), runs
+            try: return func(*args, **kwargs)
+            finally: self._local.runs = prev
+        return inner
+
+    def record(self, stage, seconds, n=1):
+        for r in self._runs(): r.add(stage, seconds, n)
+
+    def card(self, card_id, seconds):
+        for r in self._runs(): r.add_card(card_id, seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        if not self._runs():
+            yield
+            return
+        t = time.perf_counter()
+        try: yield
+        finally: self.record(stage, time.perf_counter() - t)
+
+    def timed(self, stage=None):
+        def wrap(func):
+            name = stage or func.__name__
+            @wraps(func)
+            def inner(*args, **kwargs):
+                with self.timer(name): return func(*args, **kwargs)
+            return inner
+        return wrap
+
+    def to_jsonl(self, summaries=None):
+        return "".join(json.dumps(s, ensure_ascii=False) + "\n" for s in (self.history if summaries is None else summaries))
+
+    def export(self, summaries=None, path=None):
+        # JSON lines 추가 저장 (실행 간 비교용)
+        with open(path or self.export_path, "a", encoding="utf-8") as f: f.write(self.to_jsonl(summaries))
+
+    def load_last(self, label, path=None, chunk=1 << 16):
+        # 저장된 JSON lines 에서 label 의 가장 최근 요약 (다른 프로세스의 run, 예: tcg_refresh.py). 없으면 None
+        # rerun 마다 한 줄씩 늘어나는 파일이라 끝에서부터 블록 단위로 읽음
+        path = path or self.export_path
+        if not path or not os.path.exists(path): return None
+        with open(path, "rb") as f:
+            end, tail = f.seek(0, os.SEEK_END), b""
+            while end > 0:
+                start = max(0, end - chunk)
+                f.seek(start)
+                lines = (f.read(end - start) + tail).split(b"\n")
+                tail, end = (lines.pop(0) if start > 0 else b""), start   # 잘린 첫 줄은 앞 블록과 합침
+                for line in reversed(lines):
+                    try: summary = json.loads(line)
+                    except ValueError: continue
+                    if isinstance(summary, dict) and summary.get("label") == label: return summary
+        return None
+
+metrics = Metrics()
+
+# --- cProfile (한 번의 rerun / 실행만) ---
+def start_profile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def stop_profile(profiler, limit=30, sort="cumulative"):
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import tcg_engine
+from tcg_engine import COMMIT_EVERY, REFRESH_WORKERS, Checkpoint, run_refresh
+from tcg_metrics import metrics, start_profile, stop_profile
+from tcg_storage import get_storage
+
+# 헤드리스 시세 업데이트 (UI 없이 실행 / 예약 실행)
+#   python tcg_refresh.py                         전체 업데이트 1회
+#   python tcg_refresh.py --game 바이스슈발츠 --sub 니케
+#   python tcg_refresh.py --ids S117-010EX W132-073SP
+#   python tcg_refresh.py --every 360             6시간마다 반복
+#   python tcg_refresh.py --metrics tcg_metrics.jsonl --profile   단계별 시간 기록 + cProfile 출력
+# 중단되면 같은 날 같은 대상으로 다시 실행했을 때 체크포인트부터 이어서 진행
+# 앱의 '시세 전체 업데이트' 버튼은 launch() 로 이 CLI 를 분리된 프로세스로 띄우고, 상태 파일/체크포인트만 읽음
+# 잠금 파일로 동시에 하나만 실행 (OS 파일 잠금이라 프로세스가 죽으면 자동으로 풀림)
+
+CHECKPOINT_FILE = "tcg_refresh_checkpoint.json"
+LOCK_FILE = "tcg_refresh.lock"
+STATUS_FILE = "tcg_refresh_status.json"    # 마지막(또는 실행 중인) 업데이트 상태
+LOG_FILE = "tcg_refresh.log"               # launch() 로 띄운 실행의 출력
+LAUNCH_WAIT = 15                           # 초. launch() 가 새 프로세스의 잠금을 기다리는 최대 시간
+
+try:
+    import fcntl
+    def _try_lock(f): fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    def _unlock(f): fcntl.flock(f, fcntl.LOCK_UN)
+except ImportError:         # Windows
+    import msvcrt
+    def _try_lock(f): msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    def _unlock(f): msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def log(msg):
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {msg}", flush=True)
+
+def now_str():
+    return datetime.now().isoformat(timespec="seconds")
+
+# --- LOCK / STATUS (앱과 CLI 가 공유하는 파일) ---
+class RefreshLock:
+    def __init__(self, path=LOCK_FILE):
+        self.path, self.file = path, None
+
+    def acquire(self, retries=0):
+        # 잠그지 못하면(다른 프로세스가 실행 중) False. retries: 0.2초 간격 재시도 (held() 의 짧은 확인과 겹칠 때)
+        f = open(self.path, "a+")
+        for attempt in range(retries + 1):
+            try:
+                f.seek(0)
+                _try_lock(f)
+                self.file = f
+                return True
+            except OSError:
+                if attempt < retries: time.sleep(0.2)
+        f.close()
+        return False
+
+    def release(self):
+        if self.file is None: return
+        try:
+            self.file.seek(0)
+            _unlock(self.file)
+        finally:
+            self.file.close()
+            self.file = None
+
+    def held(self):
+        # 다른 프로세스가 잠금을 잡고 있는지 (잠깐 잡았다가 바로 놓음)
+        if not self.acquire(): return True
+        self.release()
+        return False
+
+def read_status(path=STATUS_FILE):
+    try:
+        with open(path, encoding='utf-8') as f: return json.load(f)
+    except (OSError, ValueError): return {}
+
+def write_status(path=STATUS_FILE, **fields):
+    # 기존 상태에 덮어써서 저장 (임시 파일 -> 교체)
+    status = dict(read_status(path), **fields)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f: json.dump(status, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def checkpoint_done(path=CHECKPOINT_FILE):
+    # 체크포인트에 남은 완료 카드 수 (없으면 0). 중단된 실행을 다시 띄우면 여기서부터 이어서 진행
+    try:
+        with open(path, encoding='utf-8') as f: return len(json.load(f).get('done', []))
+    except (OSError, ValueError, AttributeError): return 0
+
+def is_running(lock_file=LOCK_FILE):
+    return RefreshLock(lock_file).held()
+
+def launch(argv=(), log_file=LOG_FILE, lock_file=LOCK_FILE):
+    # 분리된 프로세스로 CLI 실행 -> 브라우저 탭이 닫히거나 앱이 재시작돼도 계속 진행. 이미 실행 중이면 None
+    if is_running(lock_file): return None
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP | getattr(subprocess, "DETACHED_PROCESS", 0)}
+    else:
+        detach = {"start_new_session": True}
+    with open(log_file, "a", encoding="utf-8") as out:
+        proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), *argv], stdin=subprocess.DEVNULL, stdout=out,
+                                stderr=subprocess.STDOUT, env=dict(os.environ, PYTHONIOENCODING="utf-8"), **detach)
+    # 새 프로세스가 잠금을 잡을 때까지(시작 직후 화면이 '실행 중'으로 보이도록) 또는 먼저 끝날 때까지 대기
+    deadline = time.monotonic() + LAUNCH_WAIT
+    while proc.poll() is None and not is_running(lock_file) and time.monotonic() < deadline: time.sleep(0.2)
+    return proc.pid
+
+def select_targets(df, games=None, subs=None, ids=None):
+    if games: df = df[df['game'].isin(games)]
+    if subs: df = df[df['sub_category'].isin(subs)]
+    if ids: df = df[df['card_id'].isin(ids)]
+    return df
+
+def refresh_once(args):
+    storage = get_storage(args.storage)
+    targets = select_targets(storage.load_master(), args.game, args.sub, args.ids)
+    if targets.empty:
+        log("업데이트할 카드가 없습니다.")
+        return 0
+    checkpoint = None if args.no_resume else Checkpoint(args.checkpoint, targets['card_id'].tolist())
+    if checkpoint and checkpoint.done:
+        log(f"체크포인트에서 이어서 진행: {len(checkpoint.done)}/{len(targets)} 완료됨")
+
+    skipped = len(checkpoint.done) if checkpoint else 0
+    write_status(args.status, state="running", pid=os.getpid(), started=now_str(), finished=None, error=None,
+                 done=skipped, total=len(targets), updated=None, failed=None, seconds=None)
+
+    failed = []
+    def on_progress(n, total, row, info):
+        if not info: failed.append(row['card_id'])
+        if n % args.log_every == 0 or n == total:
+            log(f"[{n}/{total}] {row['card_id']} {info['price'] if info else '조회 실패'}")
+            write_status(args.status, done=skipped + n)
+
+    started, before, img_before = time.perf_counter(), tcg_engine.http.snapshot(), tcg_engine.images.snapshot()
+    profiler = start_profile() if args.profile else None
+    updated = run_refresh(storage, targets, args.workers, args.commit_every, checkpoint, on_progress, not args.no_images)
+    if profiler:
+        print(stop_profile(profiler), flush=True)
+        args.profile = False    # --every 반복 시 첫 실행만
+    seconds = time.perf_counter() - started
+    log(f"완료: {updated}개 갱신, {len(failed)}개 실패, {seconds:.1f}초")
+    write_status(args.status, state="done", finished=now_str(), updated=updated, failed=len(failed), seconds=round(seconds, 1))
+    net = {k: v - before[k] for k, v in tcg_engine.http.snapshot().items()}
+    log(f"HTTP: 요청 {net['requests']}, 캐시 hit {net['cache_hits']}/miss {net['cache_misses']}/304 {net['not_modified']}, "
+        f"연결 재사용 {net['reused_connections']}/신규 {net['new_connections']}, 재시도 {net['retries']}")
+    if not args.no_images:
+        img = tcg_engine.images.snapshot()
+        log(f"이미지: 다운로드 {img['downloads'] - img_before['downloads']}, 실패 {img['errors'] - img_before['errors']}, "
+            f"캐시 {img['urls']}개 {img['files_mb']} MB")
+    stages = metrics.last["refresh"]["stages"]
+    log("단계별: " + ", ".join(f"{s['stage']} {s['total_ms'] / 1000:.1f}s/{s['calls']}회" for s in stages[:6]))
+    return updated
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="TCG 시세 헤드리스 업데이트")
+    ap.add_argument("--game", nargs="*", help="게임 (포켓몬 / 원피스 / 바이스슈발츠)")
+    ap.add_argument("--sub", nargs="*", help="서브 카테고리 (예: 니케)")
+    ap.add_argument("--ids", nargs="*", help="card_id 직접 지정")
+    ap.add_argument("--workers", type=int, default=REFRESH_WORKERS)
+    ap.add_argument("--commit-every", type=int, default=COMMIT_EVERY)
+    ap.add_argument("--every", type=float, default=0, help="N분마다 반복 실행 (0: 1회)")
+    ap.add_argument("--storage", choices=["csv", "sqlite"], help="기본값: TCG_STORAGE / tcg.db 유무")
+    ap.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    ap.add_argument("--no-resume", action="store_true", help="체크포인트 무시")
+    ap.add_argument("--lock", default=LOCK_FILE, help="동시 실행 방지 잠금 파일")
+    ap.add_argument("--status", default=STATUS_FILE, help="실행 상태 파일 (앱 대시보드가 읽음)")
+    ap.add_argument("--log-every", type=int, default=25)
+    ap.add_argument("--no-cache", action="store_true", help="HTTP 응답 캐시 사용 안 함")
+    ap.add_argument("--no-images", action="store_true", help="카드 이미지 캐시(썸네일) 단계 생략")
+    ap.add_argument("--metrics", default=metrics.export_path, help="실행별 단계 시간을 JSON lines 로 추가 저장할 파일")
+    ap.add_argument("--profile", action="store_true", help="첫 실행을 cProfile 로 측정해 출력 (메인 스레드)")
+    args = ap.parse_args(argv)
+    if args.no_cache: tcg_engine.http.cache_ttl = 0
+    metrics.export_path = args.metrics
+
+    lock = RefreshLock(args.lock)
+    if not lock.acquire(retries=5):
+        log(f"이미 다른 업데이트가 실행 중입니다 ({args.lock}).")
+        return 2
+    try:
+        while True:
+            try: refresh_once(args)
+            except KeyboardInterrupt:
+                write_status(args.status, state="interrupted", finished=now_str())
+                raise
+            except Exception as e:
+                log(f"업데이트 오류: {e!r}")
+                write_status(args.status, state="error", finished=now_str(), error=repr(e))
+                if not args.every: return 1
+            if not args.every: return 0
+            log(f"다음 실행까지 {args.every:g}분 대기")
+            time.sleep(args.every * 60)
+    finally:
+        lock.release()
+
+if __name__ == "__main__":
+    try: sys.exit(main())
+    except KeyboardInterrupt:
+        log("중단됨 (체크포인트 저장됨, 다시 실행하면 이어서 진행)")
+        sys.exit(130)
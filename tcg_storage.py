@@ -0,0 +1,281 @@
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+import pandas as pd
+
+from tcg_history import compact_rows, today_str
+
+# --- [CORE] DATA STORAGE ---
+DATA_FILE = "tcg_master_db.csv"
+HISTORY_FILE = "tcg_price_history.csv"
+DB_FILE = "tcg.db"
+
+MASTER_COLUMNS = ["card_id", "game", "sub_category", "last_price", "image_url", "stock", "title", "title_ko", "detail_url"]
+HISTORY_COLUMNS = ["date", "card_id", "price", "stock"]  # 가격/재고가 바뀐 날만 기록
+
+def normalize_master(df):
+    df = df.reindex(columns=MASTER_COLUMNS).fillna("")
+    df['last_price'] = pd.to_numeric(df['last_price'], errors='coerce').fillna(0).astype(int)
+    if not df.empty:
+        mask = (df['sub_category'] == '일반')
+        df.loc[mask, 'sub_category'] = df.loc[mask, 'game']
+    return df
+
+def normalize_history(history):
+    history = history.reindex(columns=HISTORY_COLUMNS)
+    history['price'] = pd.to_numeric(history['price'], errors='coerce').fillna(0).astype(int)
+    history['stock'] = history['stock'].fillna("").astype(str)
+    return history
+
+SUMMARY_TEXT_COLUMNS = ["card_id", "game", "sub_category", "title_ko", "ch_str", "ch_col"]
+
+def normalize_summary(df):
+    for c in SUMMARY_TEXT_COLUMNS:
+        if c in df.columns: df[c] = df[c].fillna("").astype(str)
+    return df
+
+def normalize_records(records):
+    # [(card_id, price[, stock]), ...] -> {card_id: (price, stock)} (같은 카드는 마지막 값)
+    out = {}
+    for rec in records:
+        cid, price, stock = (tuple(rec) + ("",))[:3]
+        out[str(cid)] = (int(price), "" if stock is None else str(stock))
+    return out
+
+# --- CSV BACKEND ---
+class CsvStorage:
+    def __init__(self, data_file=DATA_FILE, history_file=HISTORY_FILE):
+        self.data_file, self.history_file = data_file, history_file
+        self.summary_prefix = os.path.splitext(data_file)[0] + "_summary"
+
+    def _write(self, df, path):
+        # 임시 파일에 쓴 뒤 교체 -> 쓰는 도중 종료돼도 기존 파일이 잘리지 않음
+        tmp = path + ".tmp"
+        df.to_csv(tmp, index=False, encoding='utf-8-sig')
+        os.replace(tmp, path)
+
+    def version(self):
+        # 파일 수정시각/크기 -> 데이터가 바뀌면 값이 달라짐 (UI 캐시 키)
+        stats = [os.stat(p) if os.path.exists(p) else None for p in (self.data_file, self.history_file)]
+        return tuple((st.st_mtime_ns, st.st_size) if st else None for st in stats)
+
+    def load_master(self):
+        if not os.path.exists(self.data_file):
+            return pd.DataFrame(columns=MASTER_COLUMNS)
+        return normalize_master(pd.read_csv(self.data_file))
+
+    def save_master(self, df):
+        self._write(df, self.data_file)
+
+    def upsert_cards(self, rows):
+        if rows.empty: return
+        # 기존 행은 제자리에서 갱신, 새 카드는 뒤에 추가
+        merged = self.load_master().set_index('card_id')
+        new = rows.reindex(columns=MASTER_COLUMNS).set_index('card_id')
+        merged = pd.concat([merged, new[~new.index.isin(merged.index)]])
+        merged.update(new)
+        self._write(merged.reset_index()[MASTER_COLUMNS], self.data_file)
+
+    def load_history(self):
+        if not os.path.exists(self.history_file):
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return normalize_history(pd.read_csv(self.history_file, dtype={"stock": str}))
+
+    def record_prices(self, records, date=None):
+        # records: [(card_id, price, stock), ...] -> 직전 기록과 가격/재고가 다른 카드만 해당 날짜에 기록
+        recs = normalize_records(records)
+        if not recs: return
+        date = date or today_str()
+        history = self.load_history()
+        new = pd.DataFrame([{"date": date, "card_id": cid, "price": p, "stock": st} for cid, (p, st) in recs.items()])
+        history = history[~((history['date'] == date) & history['card_id'].isin(new['card_id']))]
+        prev = history[history['date'] < date].sort_values('date', kind='stable')
+        prev = prev.drop_duplicates(subset='card_id', keep='last').set_index('card_id').reindex(new['card_id'])
+        same = (prev['price'].values == new['price'].values) & (prev['stock'].values == new['stock'].values)
+        self._write(pd.concat([history, new[~same]], ignore_index=True), self.history_file)
+
+    def compact_history(self):
+        # 예전 형식(매일 한 행) 파일을 변경분만 남기도록 정리
+        history = self.load_history()
+        compact = compact_rows(history).sort_values(['date', 'card_id'], kind='stable')
+        self._write(compact, self.history_file)
+        return len(history), len(compact)
+
+    def save_summaries(self, tables, key):
+        # 요약 표는 version() 대상 파일이 아니므로 저장해도 캐시 키가 바뀌지 않음
+        for name, df in tables.items():
+            self._write(df, f"{self.summary_prefix}_{name}.csv")
+        tmp = self.summary_prefix + ".json.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump({"key": key, "tables": list(tables)}, f)
+        os.replace(tmp, self.summary_prefix + ".json")
+
+    def load_summaries(self):
+        try:
+            with open(self.summary_prefix + ".json", encoding='utf-8') as f: meta = json.load(f)
+            tables = {name: normalize_summary(pd.read_csv(f"{self.summary_prefix}_{name}.csv")) for name in meta['tables']}
+        except (OSError, ValueError, KeyError): return None, None
+        return meta['key'], tables
+
+# --- SQLITE BACKEND ---
+class SqliteStorage:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cards (
+            card_id TEXT PRIMARY KEY, game TEXT, sub_category TEXT, last_price INTEGER,
+            image_url TEXT, stock TEXT, title TEXT, title_ko TEXT, detail_url TEXT
+        );
+        CREATE TABLE IF NOT EXISTS price_history (
+            date TEXT NOT NULL, card_id TEXT NOT NULL, price INTEGER, stock TEXT DEFAULT '',
+            PRIMARY KEY (card_id, date)
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_date ON price_history (date, card_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+    """
+
+    def __init__(self, db_file=DB_FILE):
+        self.db_file = db_file
+        with self._connect() as con:
+            con.executescript(self.SCHEMA)
+            cols = [r[1] for r in con.execute("PRAGMA table_info(price_history)")]
+            if "stock" not in cols:
+                con.execute("ALTER TABLE price_history ADD COLUMN stock TEXT DEFAULT ''")
+
+    @contextmanager
+    def _connect(self):
+        # 호출마다 새 연결 -> 스레드 간 공유 없음. 커밋(예외 시 롤백) 후 바로 닫음 (fd / WAL 잠금이 남지 않음)
+        con = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            with con: yield con
+        finally:
+            con.close()
+
+    def _upsert_sql(self):
+        cols = ", ".join(MASTER_COLUMNS)
+        marks = ", ".join("?" for _ in MASTER_COLUMNS)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in MASTER_COLUMNS if c != "card_id")
+        return f"INSERT INTO cards ({cols}) VALUES ({marks}) ON CONFLICT(card_id) DO UPDATE SET {updates}"
+
+    def _card_rows(self, df):
+        df = df.reindex(columns=MASTER_COLUMNS).fillna("")
+        df['last_price'] = pd.to_numeric(df['last_price'], errors='coerce').fillna(0).astype(int)
+        return [tuple(str(v) if c != "last_price" else int(v) for c, v in zip(MASTER_COLUMNS, row))
+                for row in df.itertuples(index=False)]
+
+    def _bump(self, con):
+        # 쓰기 트랜잭션마다 증가 -> UI 캐시 무효화용 버전
+        con.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+    def version(self):
+        with self._connect() as con:
+            return con.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def load_master(self):
+        with self._connect() as con:
+            df = pd.read_sql_query(f"SELECT {', '.join(MASTER_COLUMNS)} FROM cards ORDER BY rowid", con)
+        return normalize_master(df)
+
+    def save_master(self, df):
+        # 전체 교체(삭제 등)도 하나의 트랜잭션으로 처리
+        with self._connect() as con:
+            con.execute("DELETE FROM cards")
+            con.executemany(self._upsert_sql(), self._card_rows(df))
+            self._bump(con)
+
+    def upsert_cards(self, rows):
+        if rows.empty: return
+        with self._connect() as con:
+            con.executemany(self._upsert_sql(), self._card_rows(rows))
+            self._bump(con)
+
+    def load_history(self):
+        with self._connect() as con:
+            df = pd.read_sql_query("SELECT date, card_id, price, stock FROM price_history ORDER BY date, rowid", con)
+        return normalize_history(df)
+
+    def _write_history(self, con, date, recs):
+        # 직전 기록과 같으면 해당 날짜 행 삭제, 다르면 upsert -> 변경분만 남음
+        upserts, deletes = [], []
+        for cid, (price, stock) in recs.items():
+            prev = con.execute(
+                "SELECT price, stock FROM price_history WHERE card_id = ? AND date < ? ORDER BY date DESC LIMIT 1", (cid, date)
+            ).fetchone()
+            if prev and prev[0] == price and (prev[1] or "") == stock: deletes.append((cid, date))
+            else: upserts.append((date, cid, price, stock))
+        con.executemany("DELETE FROM price_history WHERE card_id = ? AND date = ?", deletes)
+        con.executemany(
+            "INSERT INTO price_history (date, card_id, price, stock) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(card_id, date) DO UPDATE SET price=excluded.price, stock=excluded.stock", upserts
+        )
+
+    def record_prices(self, records, date=None):
+        recs = normalize_records(records)
+        if not recs: return
+        with self._connect() as con:
+            self._write_history(con, date or today_str(), recs)
+            self._bump(con)
+
+    def _replace_history(self, con, history):
+        con.execute("DELETE FROM price_history")
+        con.executemany(
+            "INSERT INTO price_history (date, card_id, price, stock) VALUES (?, ?, ?, ?)",
+            [(str(d), str(c), int(p), str(st)) for d, c, p, st in history[HISTORY_COLUMNS].itertuples(index=False)]
+        )
+
+    def compact_history(self):
+        history = self.load_history()
+        compact = compact_rows(history).sort_values(['date', 'card_id'], kind='stable')
+        with self._connect() as con:
+            self._replace_history(con, compact)
+            self._bump(con)
+        return len(history), len(compact)
+
+    def save_summaries(self, tables, key):
+        # 버전 카운터는 올리지 않음 (요약 저장은 데이터 변경이 아님)
+        with self._connect() as con:
+            for name, df in tables.items():
+                df.to_sql(f"summary_{name}", con, if_exists="replace", index=False)
+            con.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('summary_key', ?)", (key,))
+            con.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('summary_tables', ?)", (",".join(tables),))
+
+    def load_summaries(self):
+        with self._connect() as con:
+            meta = dict(con.execute("SELECT key, value FROM meta WHERE key IN ('summary_key', 'summary_tables')").fetchall())
+            if len(meta) < 2: return None, None
+            try:
+                tables = {name: normalize_summary(pd.read_sql_query(f"SELECT * FROM summary_{name}", con))
+                          for name in meta['summary_tables'].split(",")}
+            except Exception: return None, None
+        return meta['summary_key'], tables
+
+    def import_csv(self, data_file=DATA_FILE, history_file=HISTORY_FILE):
+        # 기존 CSV -> SQLite 일괄 이전 (같은 card_id/date는 마지막 값, 변경분만 남김)
+        src = CsvStorage(data_file, history_file)
+        master = src.load_master()
+        history = src.load_history().drop_duplicates(subset=['card_id', 'date'], keep='last')
+        history = compact_rows(history).sort_values(['date', 'card_id'], kind='stable')
+        with self._connect() as con:
+            con.executemany(self._upsert_sql(), self._card_rows(master))
+            self._replace_history(con, history)
+            self._bump(con)
+        return len(master), len(history)
+
+def get_storage(backend=None):
+    # TCG_STORAGE=csv|sqlite, 지정이 없으면 DB 파일이 있을 때만 SQLite 사용
+    backend = backend or os.environ.get("TCG_STORAGE") or ("sqlite" if os.path.exists(DB_FILE) else "csv")
+    return SqliteStorage() if backend == "sqlite" else CsvStorage()
+
+if __name__ == "__main__":
+    # python tcg_storage.py import-csv | compact
+    if sys.argv[1:2] == ["import-csv"]:
+        n_cards, n_hist = SqliteStorage().import_csv()
+        print(f"{DB_FILE}: cards {n_cards}, history {n_hist}")
+    elif sys.argv[1:2] == ["compact"]:
+        before, after = get_storage().compact_history()
+        print(f"history rows: {before} -> {after}")
+    else:
+        print("usage: python tcg_storage.py import-csv | compact")
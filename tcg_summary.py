@@ -0,0 +1,63 @@
+import pandas as pd
+
+from tcg_history import PriceHistory, from_day, to_day, today_str
+
+# --- SUMMARY TABLES (쓰기 시점에 계산해서 저장) ---
+# 대시보드는 이 표들만 읽음 -> 렌더링 비용이 인벤토리 크기와 무관
+#   changes    : card_id별 전일 대비 가격 변동 (그리드 표시용)
+#   movers     : 변동 있는 카드 (변동률 순)
+#   categories : game/sub_category별 카드 수, 총액, 품절 수
+#   price_list : 가격순 전체 목록 (인벤토리 관리 표)
+SUMMARY_TABLES = ["changes", "movers", "categories", "price_list"]
+OUT_OF_STOCK = {"×", "0", ""}
+
+def get_price_changes(df, history):
+    # 카드별 "오늘 이전 마지막 가격"을 한 번에 조회 (card_id 인덱스), history: PriceHistory
+    out = df[['card_id', 'last_price']].drop_duplicates(subset='card_id').set_index('card_id')
+    prev = history.price_as_of(from_day(to_day(today_str()) - 1))
+    out['prev_price'] = pd.to_numeric(prev.reindex(out.index), errors='coerce')
+    out['diff'] = out['last_price'] - out['prev_price']
+    out['pct'] = (out['diff'] / out['prev_price'].where(out['prev_price'] > 0) * 100).round(1)
+
+    out['ch_str'] = "-"
+    out['ch_col'] = "#94a3b8"
+    up, down = out['diff'] > 0, out['diff'] < 0
+    out.loc[up, 'ch_str'] = out.loc[up, 'diff'].map(lambda d: f"▲ {int(d):,}")
+    out.loc[up, 'ch_col'] = "#E11D48"
+    out.loc[down, 'ch_str'] = out.loc[down, 'diff'].map(lambda d: f"▼ {abs(int(d)):,}")
+    out.loc[down, 'ch_col'] = "#2563EB"
+    return out
+
+def build_summaries(master, history):
+    changes = get_price_changes(master, history)
+
+    moved = master.join(changes[['prev_price', 'diff', 'pct', 'ch_str']], on='card_id')
+    moved = moved[moved['diff'].fillna(0) != 0].sort_values(by="pct", ascending=False)
+    movers = moved[['card_id', 'game', 'sub_category', 'title_ko', 'last_price', 'prev_price', 'diff', 'pct', 'ch_str']]
+
+    cat = master.assign(out_of_stock=master['stock'].astype(str).str.strip().isin(OUT_OF_STOCK))
+    categories = cat.groupby(['game', 'sub_category'], sort=True).agg(
+        Count=('card_id', 'size'), Value=('last_price', 'sum'), OutOfStock=('out_of_stock', 'sum')
+    ).reset_index()
+
+    price_list = master[['sub_category', 'card_id', 'title_ko', 'last_price']].sort_values(by="last_price", ascending=False)
+
+    return {"changes": changes.reset_index(), "movers": movers.reset_index(drop=True),
+            "categories": categories, "price_list": price_list.reset_index(drop=True)}
+
+def summary_key(storage):
+    # 데이터 버전 + 날짜 (전일 대비 값이라 날짜가 바뀌면 다시 계산)
+    return f"{today_str()}:{storage.version()}"
+
+def rebuild_summaries(storage):
+    tables = build_summaries(storage.load_master(), PriceHistory.from_frame(storage.load_history()))
+    storage.save_summaries(tables, summary_key(storage))
+    return tables
+
+def get_summaries(storage):
+    # 저장된 요약이 최신이면 그대로, 아니면(중단된 업데이트 등) 다시 계산해서 저장
+    key, tables = storage.load_summaries()
+    if key != summary_key(storage) or tables is None:
+        tables = rebuild_summaries(storage)
+    tables['changes'] = tables['changes'].set_index('card_id')
+    return tables
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import time
+
+# --- TRANSLATION CACHE (ja -> ko) ---
+CACHE_FILE = "tcg_translate_cache.json"
+CACHE_MAX_ENTRIES = 20000
+CACHE_MAX_AGE_DAYS = 180
+BATCH_CHARS = 4500      # 구글 번역 1회 요청 글자 수 제한(5000) 이하로 묶음
+
+class TranslationCache:
+    # translator: .translate(text) 만 있으면 됨 (테스트에서는 로컬 스텁으로 교체 가능)
+    def __init__(self, translator, path=CACHE_FILE, max_entries=CACHE_MAX_ENTRIES, max_age_days=CACHE_MAX_AGE_DAYS):
+        self.translator, self.path = translator, path
+        self.max_entries, self.max_age = max_entries, max_age_days * 86400
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "calls": 0}
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path): return {}
+        try:
+            with open(self.path, encoding='utf-8') as f: return json.load(f)
+        except (OSError, ValueError): return {}
+
+    def save(self):
+        if not self.path: return
+        with self.lock:
+            self._evict()
+            data = json.dumps(self.entries, ensure_ascii=False)
+        tmp = f"{self.path}.{threading.get_ident()}.tmp"   # 작업 스레드별 임시 파일 (동시 저장 충돌 방지)
+        with open(tmp, 'w', encoding='utf-8') as f: f.write(data)
+        os.replace(tmp, self.path)
+
+    def _evict(self):
+        # 오래된 항목 제거 후, 개수 초과분은 가장 오래 안 쓴 것부터 제거
+        now = time.time()
+        self.entries = {k: v for k, v in self.entries.items() if now - v['ts'] < self.max_age}
+        if len(self.entries) > self.max_entries:
+            keep = sorted(self.entries.items(), key=lambda kv: kv[1]['used'], reverse=True)[:self.max_entries]
+            self.entries = dict(keep)
+
+    def _get(self, text):
+        with self.lock:
+            entry = self.entries.get(text)
+            if entry and time.time() - entry['ts'] < self.max_age:
+                entry['used'] = time.time()
+                self.stats['hits'] += 1
+                return entry['ko']
+            self.stats['misses'] += 1
+            return None
+
+    def _put(self, text, ko):
+        now = time.time()
+        with self.lock: self.entries[text] = {"ko": ko, "ts": now, "used": now}
+
+    def _call(self, text):
+        with self.lock: self.stats['calls'] += 1
+        try: return self.translator.translate(text) or text
+        except Exception: return None
+
+    def translate(self, text):
+        return self.translate_many([text])[0]
+
+    def translate_many(self, texts):
+        # 캐시에 없는 문장만 모아서 줄바꿈으로 묶어 한 번에 번역, 실패 시 원문 유지
+        texts = [str(t) for t in texts]
+        result = {t: self._get(t) for t in dict.fromkeys(texts)}
+        misses = [t for t, ko in result.items() if ko is None and t.strip()]
+        for chunk in self._chunks([t for t in misses if "\n" not in t]):
+            out = self._call("\n".join(chunk)) if len(chunk) > 1 else None
+            lines = out.split("\n") if out else []
+            if len(lines) != len(chunk):
+                lines = [self._call(t) for t in chunk]
+            for t, ko in zip(chunk, lines):
+                if ko: self._put(t, ko.strip()); result[t] = ko.strip()
+        for t in misses:
+            if "\n" in t:
+                ko = self._call(t)
+                if ko: self._put(t, ko); result[t] = ko
+        if misses: self.save()
+        return [result[t] or t for t in texts]
+
+    def _chunks(self, texts):
+        chunk, size = [], 0
+        for t in texts:
+            if chunk and size + len(t) + 1 > BATCH_CHARS:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(t)
+            size += len(t) + 1
+        if chunk: yield chunk
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(tcg_*.py)을 import 할 수 있게
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
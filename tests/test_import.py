@@ -0,0 +1,33 @@
+import io
+
+from tcg_engine import parse_import
+
+# 대량 등록 입력 파싱 (붙여넣기 + CSV 업로드)
+#   python -m pytest tests
+
+def csv(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+def test_headerless_id_list():
+    # 머리글 없는 ID 목록: 첫 줄도 카드로 등록되어야 함
+    items = parse_import(csv_file=csv("S117-010EX\nS117-024SP\nS117-058SP\n"), game="바이스슈발츠", sub_category="니케")
+    assert items['card_id'].tolist() == ["S117-010EX", "S117-024SP", "S117-058SP"]
+    assert set(items['game']) == {"바이스슈발츠"} and set(items['sub_category']) == {"니케"}
+
+def test_headerless_columns_in_order():
+    items = parse_import(csv_file=csv("SV2a-201,포켓몬\nOP05-119,원피스\n"))
+    assert items[['card_id', 'game', 'sub_category']].values.tolist() == [["SV2a-201", "포켓몬", "포켓몬"],
+                                                                          ["OP05-119", "원피스", "원피스"]]
+
+def test_single_headerless_line():
+    assert parse_import(csv_file=csv("S117-010EX"), game="바이스슈발츠")['card_id'].tolist() == ["S117-010EX"]
+
+def test_header_row():
+    items = parse_import(csv_file=csv("\ufeffCard_ID,Game\nS117-010EX,바이스슈발츠\nSV2a-201,\n"), game="포켓몬")
+    assert items['card_id'].tolist() == ["S117-010EX", "SV2a-201"]
+    assert items['game'].tolist() == ["바이스슈발츠", "포켓몬"]
+    assert items['sub_category'].tolist() == ["기타", "포켓몬"]
+
+def test_text_and_csv_combined():
+    items = parse_import("A-1, A-2\nA-3", csv_file=csv("card_id\nA-4\n"), game="원피스")
+    assert items['card_id'].tolist() == ["A-1", "A-2", "A-3", "A-4"]
@@ -0,0 +1,84 @@
+import json
+import time
+
+from tcg_translate import BATCH_CHARS, TranslationCache
+
+# 네트워크 없이 TranslationCache 검증: 호출을 세는 로컬 스텁 번역기 사용
+#   python -m pytest tests
+
+class StubTranslator:
+    # "ja" -> "ko:ja" (줄 단위), 받은 요청을 calls 에 기록
+    def __init__(self, drop_lines=False):
+        self.calls, self.drop_lines = [], drop_lines
+
+    def translate(self, text):
+        self.calls.append(text)
+        lines = [f"ko:{line}" for line in text.split("\n")]
+        if self.drop_lines and len(lines) > 1: lines = lines[:-1]   # 줄 수가 안 맞는 응답 흉내
+        return "\n".join(lines)
+
+def make_cache(tmp_path, **kwargs):
+    stub = StubTranslator(kwargs.pop("drop_lines", False))
+    return stub, TranslationCache(stub, path=str(tmp_path / "cache.json"), **kwargs)
+
+def test_hits_and_misses(tmp_path):
+    stub, cache = make_cache(tmp_path)
+    assert cache.translate_many(["a", "b", "a"]) == ["ko:a", "ko:b", "ko:a"]
+    assert cache.stats == {"hits": 0, "misses": 2, "calls": 1}
+    assert cache.translate_many(["a", "b"]) == ["ko:a", "ko:b"]
+    assert cache.stats == {"hits": 2, "misses": 2, "calls": 1}     # 두 번째는 호출 없음
+    assert len(stub.calls) == 1
+
+def test_persisted_between_instances(tmp_path):
+    stub, cache = make_cache(tmp_path)
+    cache.translate("a")
+    stub2, cache2 = make_cache(tmp_path)
+    assert cache2.translate("a") == "ko:a"
+    assert stub2.calls == [] and cache2.stats["hits"] == 1
+
+def test_misses_are_batched(tmp_path):
+    stub, cache = make_cache(tmp_path)
+    texts = [f"title{i:03d}" for i in range(100)]
+    assert cache.translate_many(texts) == [f"ko:{t}" for t in texts]
+    assert stub.calls == ["\n".join(texts)]
+
+def test_batches_split_by_size(tmp_path):
+    stub, cache = make_cache(tmp_path)
+    texts = [f"{i:04d}" + "x" * 995 for i in range(10)]      # 1000자 x 10 -> BATCH_CHARS 이하 묶음 여러 개
+    assert cache.translate_many(texts) == [f"ko:{t}" for t in texts]
+    assert 1 < len(stub.calls) < len(texts)
+    assert all(len(c) <= BATCH_CHARS for c in stub.calls)
+
+def test_fallback_when_lines_do_not_round_trip(tmp_path):
+    stub, cache = make_cache(tmp_path, drop_lines=True)
+    assert cache.translate_many(["a", "b", "c"]) == ["ko:a", "ko:b", "ko:c"]
+    assert stub.calls == ["a\nb\nc", "a", "b", "c"]              # 묶음 1회 + 항목별 재시도
+    assert cache.stats["calls"] == 4
+
+def test_failed_call_keeps_original(tmp_path):
+    class Broken:
+        def translate(self, text): raise RuntimeError("offline")
+    cache = TranslationCache(Broken(), path=str(tmp_path / "cache.json"))
+    assert cache.translate_many(["a", "b"]) == ["a", "b"]
+    assert cache.entries == {}                                  # 실패는 캐시하지 않음
+
+def test_age_eviction(tmp_path):
+    stub, cache = make_cache(tmp_path, max_age_days=1)
+    cache.translate_many(["old", "new"])
+    cache.entries["old"]["ts"] -= 2 * 86400
+    assert cache.translate("old") == "ko:old"                  # 만료 -> 다시 번역
+    assert stub.calls[-1] == "old"
+    cache.entries["new"]["ts"] -= 2 * 86400
+    cache.save()
+    with open(cache.path, encoding="utf-8") as f: assert set(json.load(f)) == {"old"}
+
+def test_size_eviction_keeps_recently_used(tmp_path):
+    stub, cache = make_cache(tmp_path)
+    cache.translate_many(["a", "b", "c"])
+    cache.max_entries = 2
+    now = time.time()
+    for i, t in enumerate(["b", "a", "c"]): cache.entries[t]["used"] = now - 10 + i   # b 가 가장 오래 안 씀
+    cache.save()
+    assert set(cache.entries) == {"a", "c"}
+    stub2, cache2 = make_cache(tmp_path)
+    assert set(cache2.entries) == {"a", "c"}